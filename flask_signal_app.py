@@ -15,21 +15,31 @@ app = Flask(__name__)
 # Configuration
 RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'watchlist_Scanner', 'updated_Results_for_scan')
 
-def check_in_channel(df, idx, channel_period=3):
+def calculate_channel_bounds(df, channel_period=3):
+    """
+    Get the channel high/low for every bar in one pass
+
+    Bar idx's bounds are the highest High and lowest Low over the
+    channel_period * 5 bars before it (not including idx itself).
+
+    Returns:
+        (channel_high, channel_low) arrays aligned with df
+    """
+    lookback_days = channel_period * 5
+
+    channel_high = df['High'].rolling(lookback_days, min_periods=1).max().shift(1).to_numpy()
+    channel_low = df['Low'].rolling(lookback_days, min_periods=1).min().shift(1).to_numpy()
+
+    return channel_high, channel_low
+
+def check_in_channel(close, channel_high, channel_low, idx, channel_period=3):
     """Check if price is trading within a defined channel"""
     lookback_days = channel_period * 5
 
     if idx < lookback_days:
         return False
 
-    current_close = df['Close'].iloc[idx]
-    previous_highs = df['High'].iloc[idx-lookback_days:idx]
-    previous_lows = df['Low'].iloc[idx-lookback_days:idx]
-
-    channel_high = previous_highs.max()
-    channel_low = previous_lows.min()
-
-    if channel_low <= current_close <= channel_high:
+    if channel_low[idx] <= close[idx] <= channel_high[idx]:
         return True
 
     return False
@@ -70,13 +80,15 @@ def find_maroon_signals(ticker_symbol, hold_days=63):
         efi_results = indicator.calculate(df)
         zones = calculate_price_range_zones(df, lookback_period=100)
         trend = determine_trend(df, lookback_period=50)
+        close = df['Close'].to_numpy()
+        channel_high, channel_low = calculate_channel_bounds(df, channel_period=3)
 
         # Find all MAROON signals
         signals = []
 
         for i in range(100, len(df) - hold_days):
             # Check all conditions
-            in_channel = check_in_channel(df, i, channel_period=3)
+            in_channel = check_in_channel(close, channel_high, channel_low, i, channel_period=3)
             fi_color = efi_results['fi_color'].iloc[i]
             normalized_price = efi_results['normalized_price'].iloc[i]
             price_zone = zones['price_zone'].iloc[i]
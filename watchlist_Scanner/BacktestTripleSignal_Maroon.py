@@ -1,9 +1,15 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from EFI_Indicator import EFI_Indicator
-from PriceRangeZones import calculate_price_range_zones, determine_trend
+from functools import partial
+from numpy.lib.stride_tricks import sliding_window_view
+from EFI_Indicator import EFI_Indicator, COLOR_MAROON, compile_kernels
+from PriceRangeZones import calculate_price_range_zones, determine_trend, PRICE_ZONES, TRENDS
+from _njit import njit, NUMBA_AVAILABLE
+from _cache import cache_dir, cache_key, cached_array, cached_frame, read_cached_frame, source_version, write_cached_frame
+from _prices import read_price_csv
 
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,49 +18,214 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 results_dir = os.path.join(script_dir, 'updated_Results_for_scan')
 buylist_dir = os.path.join(script_dir, 'buylist')
 output_file = os.path.join(buylist_dir, 'triple_signal_maroon_backtest_results.txt')
+indicator_cache_dir = cache_dir('maroon_indicators')
+ohlcv_cache_dir = cache_dir('maroon_ohlcv')
+trade_cache_dir = cache_dir('maroon_trades')
+
+# Fields recorded for every trade
+TRADE_COLUMNS = [
+    'ticker', 'entry_date', 'entry_price', 'exit_date', 'exit_price',
+    'pnl_pct', 'pnl_dollars', 'hold_days', 'normalized_price', 'force_index',
+    'range_position_pct', 'range_floor', 'range_ceiling'
+]
+
+# One report table row: ticker, entry date, entry price, exit price, P&L %, normalized price
+TRADE_ROW_FORMAT = "%-8s %-12s $%-9.2f $%-9.2f %8.2f%% %10.2f"
+
+# The indicators and scan only read these, so they're the only columns kept
+PRICE_DTYPES = {'High': np.float32, 'Low': np.float32, 'Close': np.float32}
 
 def get_ticker_list(results_dir):
-    """Get ticker symbols from CSV files in the results directory"""
+    """Get sorted (ticker, csv_path) pairs for the CSV files in the results directory"""
     try:
-        csv_files = [f for f in os.listdir(results_dir) if f.endswith('.csv')]
-        tickers = [f[:-4] for f in csv_files]
-        return sorted(tickers)
+        with os.scandir(results_dir) as entries:
+            return sorted((entry.name[:-4], entry.path) for entry in entries if entry.name.endswith('.csv'))
     except Exception as e:
         print(f"Error reading results directory: {e}")
         return []
 
-def check_in_channel(df, idx, channel_period=3):
+def load_price_data(ticker_symbol, csv_file):
     """
-    Check if price is trading within a defined channel at a specific index
+    Load a ticker's prices, caching the parsed CSV as a binary .npy file
+
+    The cache is one structured array (date + High/Low/Close fields) in ohlcv_cache_dir,
+    memory-mapped on load, and rebuilt whenever the ticker's CSV or the CSV reader changes.
 
     Args:
-        df: DataFrame with OHLCV data
-        idx: Index to check
-        channel_period: Number of weeks to look back (default 3)
+        ticker_symbol: Stock ticker
+        csv_file: Path to the ticker's CSV file
 
     Returns:
-        Boolean - True if price is in channel
+        DataFrame with float32 High/Low/Close columns indexed by UTC date
     """
-    lookback_days = channel_period * 5
+    cache_file = os.path.join(ohlcv_cache_dir, f"{ticker_symbol}.npy")
+    key = cache_key(csv_file, source_version(read_price_csv), PRICE_DTYPES)
+
+    def build():
+        df = read_price_csv(csv_file, PRICE_DTYPES)
+        data = np.empty(len(df), dtype=[('Date', 'datetime64[ns]')] + list(PRICE_DTYPES.items()))
+        data['Date'] = df.index.tz_convert(None).values
+        for column in PRICE_DTYPES:
+            data[column] = df[column].to_numpy()
+        return data
+
+    data = cached_array(cache_file, key, build)
+    index = pd.DatetimeIndex(data['Date'], name='Date').tz_localize('UTC')
+    return pd.DataFrame({column: data[column] for column in data.dtype.names[1:]}, index=index)
+
+def indicator_version():
+    """Get the code version and EFI settings the indicator and trade caches depend on"""
+    return source_version(__file__, EFI_Indicator, calculate_price_range_zones), vars(EFI_Indicator())
+
+def calculate_indicators(ticker_symbol, csv_file, df):
+    """
+    Calculate the EFI / price zone / trend columns used by the backtest
+
+    Results are cached per ticker as Parquet in indicator_cache_dir (when
+    pyarrow is installed) and reused until the ticker's CSV, the indicator
+    settings or the indicator code change, so re-running with a different
+    hold period skips the indicator work.
+
+    Args:
+        ticker_symbol: Stock ticker
+        csv_file: Path to the ticker's CSV file
+        df: DataFrame read from csv_file
+
+    Returns:
+        DataFrame with one column per indicator output
+    """
+    indicator = EFI_Indicator()
+    cache_file = os.path.join(indicator_cache_dir, f"{ticker_symbol}.parquet")
+    key = cache_key(csv_file, *indicator_version())
+
+    def build():
+        efi_results = indicator.calculate(df)
+        zones = calculate_price_range_zones(df, lookback_period=100)
+        trend = determine_trend(df, lookback_period=50)
 
-    if idx < lookback_days:
-        return False
+        return pd.DataFrame({
+            'fi_color': efi_results['fi_color'],
+            'normalized_price': efi_results['normalized_price'],
+            'force_index': efi_results['force_index'],
+            'price_zone': zones['price_zone'],
+            'range_position_pct': zones['range_position_pct'],
+            'range_floor': zones['range_floor'],
+            'range_ceiling': zones['range_ceiling'],
+            'trend': trend
+        }, index=df.index)
+
+    return cached_frame(cache_file, key, build)
+
+@njit(cache=True)
+def _scan_maroon_signal_numba(close, high, low, normalized, fi_code, zone_code, trend_code,
+                              maroon_code, buy_zone_code, uptrend_code, normalized_limit,
+                              channel_days, hold_days, start):
+    """
+    Compiled signal scan - one pass over the bars
 
-    # Get current close and previous highs/lows
-    current_close = df['Close'].iloc[idx]
-    previous_highs = df['High'].iloc[idx-lookback_days:idx]
-    previous_lows = df['Low'].iloc[idx-lookback_days:idx]
+    The channel high/low of the previous channel_days bars is kept in
+    monotonic deques, so the whole scan is O(N).
 
-    channel_high = previous_highs.max()
-    channel_low = previous_lows.min()
+    Returns:
+        (entry_idx, exit_idx, pnl_pct) arrays, one entry per signal
+    """
+    n = len(close)
+    entry_idx = np.empty(n, dtype=np.int64)
+    count = 0
+
+    # Monotonic deques of bar indices (front = channel high / low)
+    max_q = np.empty(n, dtype=np.int64)
+    min_q = np.empty(n, dtype=np.int64)
+    max_head = 0
+    max_tail = 0
+    min_head = 0
+    min_tail = 0
+    nan_bars = 0  # bars in the window with a missing high or low
+
+    for i in range(1, n - hold_days):
+        # Bar i-1 enters the window
+        j = i - 1
+        if np.isnan(high[j]) or np.isnan(low[j]):
+            nan_bars += 1
+        else:
+            while max_tail > max_head and high[max_q[max_tail - 1]] <= high[j]:
+                max_tail -= 1
+            max_q[max_tail] = j
+            max_tail += 1
+            while min_tail > min_head and low[min_q[min_tail - 1]] >= low[j]:
+                min_tail -= 1
+            min_q[min_tail] = j
+            min_tail += 1
+
+        # Bar i-channel_days-1 leaves the window
+        old = i - channel_days - 1
+        if old >= 0:
+            if np.isnan(high[old]) or np.isnan(low[old]):
+                nan_bars -= 1
+            while max_tail > max_head and max_q[max_head] <= old:
+                max_head += 1
+            while min_tail > min_head and min_q[min_head] <= old:
+                min_head += 1
+
+        if i < start or i < channel_days or nan_bars > 0:
+            continue
 
-    # Check if current price is within the channel
-    if channel_low <= current_close <= channel_high:
-        return True
+        # 1. In Channel
+        current_close = close[i]
+        if not (low[min_q[min_head]] <= current_close <= high[max_q[max_head]]):
+            continue
 
-    return False
+        # 2-5. Buy Zone, MAROON, deep oversold, uptrend
+        if zone_code[i] != buy_zone_code or fi_code[i] != maroon_code:
+            continue
+        if not (normalized[i] < normalized_limit) or trend_code[i] != uptrend_code:
+            continue
 
-def backtest_maroon_signal(ticker_symbol, results_dir, hold_days=63):
+        entry_idx[count] = i
+        count += 1
+
+    entries = entry_idx[:count]
+    exits = entries + hold_days
+    pnl_pct = (close[exits] - close[entries]) / close[entries] * 100
+    return entries, exits, pnl_pct
+
+def _scan_maroon_signal_numpy(close, high, low, normalized, fi_code, zone_code, trend_code,
+                              maroon_code, buy_zone_code, uptrend_code, normalized_limit,
+                              channel_days, hold_days, start):
+    """Vectorized numpy version of _scan_maroon_signal_numba (used without numba)"""
+    n = len(close)
+
+    # Channel high/low of the previous channel_days bars, excluding the current bar
+    in_channel = np.zeros(n, dtype=bool)
+    if n > channel_days:
+        channel_high = sliding_window_view(high[:-1], channel_days).max(axis=1)
+        channel_low = sliding_window_view(low[:-1], channel_days).min(axis=1)
+        current_close = close[channel_days:]
+        in_channel[channel_days:] = (current_close >= channel_low) & (current_close <= channel_high)
+
+    mask = (
+        in_channel
+        & (zone_code == buy_zone_code)
+        & (fi_code == maroon_code)
+        & (normalized < normalized_limit)
+        & (trend_code == uptrend_code)
+    )
+    mask[:start] = False
+    mask[max(n - hold_days, 0):] = False
+
+    entries = np.flatnonzero(mask)
+    exits = entries + hold_days
+    pnl_pct = (close[exits] - close[entries]) / close[entries] * 100
+    return entries, exits, pnl_pct
+
+def save_trade_cache(cache_file, key, trades):
+    """Write a ticker's trades (a dict of column arrays, or None) to the trade cache"""
+    write_cached_frame(cache_file, key, pd.DataFrame(trades, columns=TRADE_COLUMNS))
+
+# Use the compiled kernel when numba is installed
+scan_maroon_signal = _scan_maroon_signal_numba if NUMBA_AVAILABLE else _scan_maroon_signal_numpy
+
+def backtest_maroon_signal(ticker_symbol, csv_file, hold_days=63):
     """
     Backtest MAROON-only strategy with normalized price constraint
 
@@ -70,137 +241,176 @@ def backtest_maroon_signal(ticker_symbol, results_dir, hold_days=63):
 
     Args:
         ticker_symbol: Stock ticker
-        results_dir: Directory containing CSV files
+        csv_file: Path to the ticker's CSV file (from get_ticker_list)
         hold_days: Number of trading days to hold (default 63 = ~1 quarter)
 
+    Results are cached per ticker and hold period in trade_cache_dir (when
+    pyarrow is installed), keyed like the indicator cache plus the hold
+    period, so unchanged tickers are skipped on later runs.
+
     Returns:
-        List of trade results
+        Dict of column name -> numpy array (one entry per trade) or None
     """
     try:
-        csv_file = os.path.join(results_dir, f"{ticker_symbol}.csv")
+        cache_file = os.path.join(trade_cache_dir, f"{ticker_symbol}_{hold_days}.parquet")
+        key = cache_key(csv_file, *indicator_version(), hold_days)
 
-        if not os.path.exists(csv_file):
-            return []
+        cached = read_cached_frame(cache_file, key)
+        if cached is not None:
+            if cached.empty:
+                return None
+            return {column: cached[column].to_numpy() for column in TRADE_COLUMNS}
 
-        # Read CSV
-        with open(csv_file, 'r') as f:
-            first_line = f.readline().strip()
-
-        has_header = 'Ticker' in first_line or 'Date' in first_line or 'Open' in first_line
-
-        if has_header:
-            df = pd.read_csv(csv_file, header=0, index_col=0)
-        else:
-            df = pd.read_csv(csv_file, header=None, index_col=0)
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-
-        df.index = pd.to_datetime(df.index, errors='coerce', utc=True)
-        df = df[df.index.notna()]
+        df = load_price_data(ticker_symbol, csv_file)
 
         if len(df) < 100 + hold_days:
-            return []
-
-        # Calculate indicators for all data
-        indicator = EFI_Indicator()
-        efi_results = indicator.calculate(df)
-        zones = calculate_price_range_zones(df, lookback_period=100)
-        trend = determine_trend(df, lookback_period=50)
-
-        # Find all MAROON signal occurrences with normalized price constraint
-        trades = []
-
+            return None
+
+        # Calculate indicators for all data (cached across runs)
+        indicators = calculate_indicators(ticker_symbol, csv_file, df)
+
+        # Pull every column used below out of pandas once
+        index_arr = df.index.values  # datetime64 (UTC)
+        close_arr = df['Close'].to_numpy(dtype=np.float64)
+        high_arr = df['High'].to_numpy(dtype=np.float64)
+        low_arr = df['Low'].to_numpy(dtype=np.float64)
+        fi_color_arr = indicators['fi_color'].cat.codes.to_numpy()
+        zone_arr = indicators['price_zone'].cat.codes.to_numpy()
+        trend_arr = indicators['trend'].cat.codes.to_numpy()
+        normalized_arr = indicators['normalized_price'].to_numpy(dtype=np.float64)
+        force_index_arr = indicators['force_index'].to_numpy()
+        range_position_arr = indicators['range_position_pct'].to_numpy()
+        range_floor_arr = indicators['range_floor'].to_numpy()
+        range_ceiling_arr = indicators['range_ceiling'].to_numpy()
+
+        # Find all MAROON signal occurrences with normalized price constraint:
+        #   1. In Channel (3 weeks = 15 bars)  2. Buy Zone  3. MAROON (only)
+        #   4. Normalized Price < -0.5         5. Uptrend
         # Start at index 100 to ensure we have enough data for indicators
         # End at len(df) - hold_days to ensure we can hold for full period
-        for i in range(100, len(df) - hold_days):
-            # Check all conditions
-            in_channel = check_in_channel(df, i, channel_period=3)
-            fi_color = efi_results['fi_color'].iloc[i]
-            normalized_price = efi_results['normalized_price'].iloc[i]
-            price_zone = zones['price_zone'].iloc[i]
-            current_trend = trend.iloc[i]
-
-            condition_1_channel = in_channel
-            condition_2_price_zone = price_zone == 'buy_zone'
-            condition_3_maroon = fi_color == 'maroon'  # ONLY MAROON
-            condition_4_normalized = normalized_price < -0.5  # More than half range below zero
-            condition_5_trend = current_trend == 'uptrend'
-
-            # If all conditions are met, record the trade
-            if condition_1_channel and condition_2_price_zone and condition_3_maroon and condition_4_normalized and condition_5_trend:
-                entry_date = df.index[i]
-                entry_price = df['Close'].iloc[i]
-
-                # Calculate exit (hold_days later)
-                exit_idx = i + hold_days
-                exit_date = df.index[exit_idx]
-                exit_price = df['Close'].iloc[exit_idx]
-
-                # Calculate P&L
-                pnl_pct = ((exit_price - entry_price) / entry_price) * 100
-                pnl_dollars = exit_price - entry_price
-
-                # Get signal details
-                force_index = efi_results['force_index'].iloc[i]
-                range_position = zones['range_position_pct'].iloc[i]
-                range_floor = zones['range_floor'].iloc[i]
-                range_ceiling = zones['range_ceiling'].iloc[i]
-
-                trades.append({
-                    'ticker': ticker_symbol,
-                    'entry_date': entry_date,
-                    'entry_price': entry_price,
-                    'exit_date': exit_date,
-                    'exit_price': exit_price,
-                    'pnl_pct': pnl_pct,
-                    'pnl_dollars': pnl_dollars,
-                    'hold_days': hold_days,
-                    'normalized_price': normalized_price,
-                    'force_index': force_index,
-                    'range_position_pct': range_position,
-                    'range_floor': range_floor,
-                    'range_ceiling': range_ceiling
-                })
+        entries, exits, pnl_pcts = scan_maroon_signal(
+            close_arr,
+            high_arr,
+            low_arr,
+            normalized_arr,
+            fi_color_arr,
+            zone_arr,
+            trend_arr,
+            COLOR_MAROON,
+            PRICE_ZONES.index('buy_zone'),
+            TRENDS.index('uptrend'),
+            -0.5,
+            3 * 5,
+            hold_days,
+            100
+        )
+
+        if len(entries) == 0:
+            save_trade_cache(cache_file, key, None)
+            return None
+
+        # Gather every trade field with one take per column
+        entry_prices = np.take(close_arr, entries)
+        exit_prices = np.take(close_arr, exits)
+
+        trades = {
+            'ticker': np.full(len(entries), ticker_symbol),
+            'entry_date': np.take(index_arr, entries),
+            'entry_price': entry_prices,
+            'exit_date': np.take(index_arr, exits),
+            'exit_price': exit_prices,
+            'pnl_pct': np.asarray(pnl_pcts),
+            'pnl_dollars': exit_prices - entry_prices,
+            'hold_days': np.full(len(entries), hold_days),
+            'normalized_price': np.take(normalized_arr, entries),
+            'force_index': np.take(force_index_arr, entries),
+            'range_position_pct': np.take(range_position_arr, entries),
+            'range_floor': np.take(range_floor_arr, entries),
+            'range_ceiling': np.take(range_ceiling_arr, entries)
+        }
+
+        save_trade_cache(cache_file, key, trades)
 
         return trades
 
     except Exception as e:
         print(f"Error backtesting {ticker_symbol}: {e}")
-        return []
+        return None
 
-def analyze_by_normalized_range(results):
+def analyze_by_normalized_range(trades_df):
     """Analyze results by normalized price depth"""
-    ranges = [
-        (-1.0, -0.75, "Very Deep Oversold (-1.0 to -0.75)"),
-        (-0.75, -0.5, "Deep Oversold (-0.75 to -0.5)"),
+    # Contiguous buckets: edges[k] <= normalized < edges[k + 1]
+    edges = np.array([-1.0, -0.75, -0.5])
+    range_names = [
+        "Very Deep Oversold (-1.0 to -0.75)",
+        "Deep Oversold (-0.75 to -0.5)",
     ]
 
-    analysis = []
-    for min_norm, max_norm, range_name in ranges:
-        filtered = [r for r in results if min_norm <= r['normalized_price'] < max_norm]
+    # Bucket every trade at once; -1 / len(range_names) are outside all ranges (as is NaN)
+    bucket = np.digitize(trades_df['normalized_price'].to_numpy(), edges) - 1
+    in_range = (bucket >= 0) & (bucket < len(range_names))
 
-        if not filtered:
-            continue
+    pnl_pct = trades_df.loc[in_range, 'pnl_pct']
+    stats = pd.DataFrame({'pnl_pct': pnl_pct, 'win': pnl_pct > 0}).groupby(bucket[in_range]).agg(
+        total=('pnl_pct', 'size'),
+        profitable=('win', 'sum'),
+        avg_pnl=('pnl_pct', 'mean'),
+        median_pnl=('pnl_pct', lambda s: np.sort(s.to_numpy())[len(s) // 2]),  # Upper middle, as before
+        best_pnl=('pnl_pct', 'max'),
+        worst_pnl=('pnl_pct', 'min')
+    )
 
-        total = len(filtered)
-        profitable = sum(1 for r in filtered if r['pnl_pct'] > 0)
-        avg_pnl = sum(r['pnl_pct'] for r in filtered) / total
-        median_pnl = sorted([r['pnl_pct'] for r in filtered])[total // 2]
-        best_pnl = max(r['pnl_pct'] for r in filtered)
-        worst_pnl = min(r['pnl_pct'] for r in filtered)
+    analysis = []
+    for bucket_id, row in stats.iterrows():
+        total = int(row['total'])
+        profitable = int(row['profitable'])
 
         analysis.append({
-            'range_name': range_name,
+            'range_name': range_names[bucket_id],
             'total': total,
             'profitable': profitable,
             'win_rate': (profitable / total * 100) if total > 0 else 0,
-            'avg_pnl': avg_pnl,
-            'median_pnl': median_pnl,
-            'best_pnl': best_pnl,
-            'worst_pnl': worst_pnl
+            'avg_pnl': row['avg_pnl'],
+            'median_pnl': row['median_pnl'],
+            'best_pnl': row['best_pnl'],
+            'worst_pnl': row['worst_pnl']
         })
 
     return analysis
 
+def top_n_positions(values, n):
+    """
+    Get the positions of the n largest values, largest first
+
+    Partitions with np.argpartition so only the selected n values get sorted.
+
+    Args:
+        values: 1-D numpy array
+        n: Number of positions to return
+
+    Returns:
+        Array of positions into values
+    """
+    if len(values) > n:
+        positions = np.argpartition(values, -n)[-n:]
+    else:
+        positions = np.arange(len(values))
+
+    return positions[np.argsort(-values[positions], kind='stable')]
+
+def format_trade_table(trades):
+    """
+    Format trades as fixed-width report rows
+
+    Args:
+        trades: DataFrame of trades in the order they should be listed
+
+    Returns:
+        List of report lines, one per trade
+    """
+    columns = ['ticker', 'entry_date_str', 'entry_price', 'exit_price', 'pnl_pct', 'normalized_price']
+    return [TRADE_ROW_FORMAT % tuple(trade) for trade in trades[columns].itertuples(index=False)]
+
 def run_maroon_backtest(hold_days=63):
     """
     Run the MAROON-only backtest analysis
@@ -236,204 +446,198 @@ def run_maroon_backtest(hold_days=63):
     print(f"Backtesting {len(tickers)} tickers for MAROON signals...")
     print()
 
-    # Run backtest for all tickers
-    all_trades = []
+    # Run backtest for all tickers - each ticker is independent, so fan out across CPU cores
+    first_trades = {column: [] for column in TRADE_COLUMNS}
+    backtest = partial(backtest_maroon_signal, hold_days=hold_days)
+    ticker_symbols = [ticker for ticker, _ in tickers]
+    csv_files = [csv_file for _, csv_file in tickers]
+    compile_kernels(PRICE_DTYPES['Close'])
 
-    for i, ticker in enumerate(tickers):
-        if (i + 1) % 100 == 0:
-            print(f"Progress: {i + 1}/{len(tickers)} tickers backtested...")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for i, trades in enumerate(executor.map(backtest, ticker_symbols, csv_files, chunksize=16)):
+            if (i + 1) % 100 == 0:
+                print(f"Progress: {i + 1}/{len(tickers)} tickers backtested...")
 
-        trades = backtest_maroon_signal(ticker, results_dir, hold_days)
+            # Keep only the FIRST signal per ticker (most recent)
+            if trades is not None:
+                for column in TRADE_COLUMNS:
+                    first_trades[column].append(trades[column][:1])  # Add only the first trade
 
-        # Keep only the FIRST signal per ticker (most recent)
-        if trades:
-            all_trades.append(trades[0])  # Add only the first trade
+    found = len(first_trades['ticker'])
 
     print()
     print(f"Backtest complete!")
-    print(f"Found {len(all_trades)} MAROON signal setups to analyze")
+    print(f"Found {found} MAROON signal setups to analyze")
     print()
 
-    if not all_trades:
+    if not found:
         print("No MAROON trades found with these strict criteria.")
         return
 
+    trades_df = pd.DataFrame({column: np.concatenate(values) for column, values in first_trades.items()})
+
+    # Format dates for the report in one pass
+    trades_df['entry_date_str'] = trades_df['entry_date'].dt.strftime('%m/%d/%Y')
+
     # Calculate overall statistics
-    total_trades = len(all_trades)
-    profitable = sum(1 for t in all_trades if t['pnl_pct'] > 0)
-    losing = sum(1 for t in all_trades if t['pnl_pct'] <= 0)
-    avg_pnl = sum(t['pnl_pct'] for t in all_trades) / total_trades
-    median_pnl = sorted([t['pnl_pct'] for t in all_trades])[total_trades // 2]
-    total_pnl_dollars = sum(t['pnl_dollars'] for t in all_trades)
+    pnl = trades_df['pnl_pct'].to_numpy()
+    total_trades = len(trades_df)
+    profitable = int((pnl > 0).sum())
+    losing = total_trades - profitable
+    avg_pnl = pnl.mean()
+    median_pnl = np.sort(pnl)[len(pnl) // 2]  # Upper middle element for even counts
+    total_pnl_dollars = trades_df['pnl_dollars'].sum()
     avg_pnl_dollars = total_pnl_dollars / total_trades
     win_rate = (profitable / total_trades * 100) if total_trades > 0 else 0
 
     # Best and worst trades
-    best_trade = max(all_trades, key=lambda x: x['pnl_pct'])
-    worst_trade = min(all_trades, key=lambda x: x['pnl_pct'])
+    best_trade = trades_df.iloc[pnl.argmax()]
+    worst_trade = trades_df.iloc[pnl.argmin()]
 
     # Analyze by normalized price depth
-    normalized_analysis = analyze_by_normalized_range(all_trades)
-
-    # Sort trades by P&L
-    all_trades.sort(key=lambda x: x['pnl_pct'], reverse=True)
-    profitable_trades = [t for t in all_trades if t['pnl_pct'] > 0]
-    losing_trades = [t for t in all_trades if t['pnl_pct'] <= 0]
-
-    # Generate report
-    report_lines = []
-    report_lines.append("=" * 80)
-    report_lines.append("MAROON SIGNAL BACKTEST - EXTREME OVERSOLD RESULTS")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append("")
-    report_lines.append("STRATEGY:")
-    report_lines.append("  Entry: When all 5 conditions are met (MAROON + deep oversold)")
-    report_lines.append(f"  Hold: {hold_days} trading days (~1 business quarter)")
-    report_lines.append("  Exit: Automatic after hold period")
-    report_lines.append("")
-    report_lines.append("KEY DIFFERENCE FROM STANDARD TRIPLE SIGNAL:")
-    report_lines.append("  - ONLY MAROON signals (not orange)")
-    report_lines.append("  - Normalized Price < -0.5 (deep in oversold territory)")
-    report_lines.append("  - This catches EXTREME capitulation moments")
-    report_lines.append("")
-    report_lines.append("=" * 80)
-    report_lines.append("OVERALL PERFORMANCE")
-    report_lines.append("=" * 80)
-    report_lines.append(f"  Total Trades: {total_trades}")
-    report_lines.append(f"  Profitable: {profitable} ({win_rate:.1f}%)")
-    report_lines.append(f"  Losing: {losing} ({(losing/total_trades*100):.1f}%)")
-    report_lines.append("")
-    report_lines.append(f"  Average P&L: {avg_pnl:+.2f}%")
-    report_lines.append(f"  Median P&L: {median_pnl:+.2f}%")
-    report_lines.append(f"  Average P&L ($): ${avg_pnl_dollars:+.2f}")
-    report_lines.append(f"  Total P&L ($): ${total_pnl_dollars:+,.2f}")
-    report_lines.append("")
-    report_lines.append(f"  Best Trade: {best_trade['ticker']} ({best_trade['pnl_pct']:+.2f}%)")
-    report_lines.append(f"  Worst Trade: {worst_trade['ticker']} ({worst_trade['pnl_pct']:+.2f}%)")
-    report_lines.append("")
-
-    # Portfolio simulation
-    portfolio_size = 1000
-    total_invested = portfolio_size * total_trades
-    total_returns = sum((t['pnl_pct'] / 100) * portfolio_size for t in all_trades)
-    portfolio_return_pct = (total_returns / total_invested) * 100
-
-    report_lines.append("PORTFOLIO SIMULATION ($1,000 per signal):")
-    report_lines.append(f"  Total Invested: ${total_invested:,.2f}")
-    report_lines.append(f"  Total Returns: ${total_returns:+,.2f}")
-    report_lines.append(f"  Portfolio Return: {portfolio_return_pct:+.2f}%")
-    report_lines.append("")
-    report_lines.append("=" * 80)
-    report_lines.append("")
-
-    # Normalized price depth analysis
-    if normalized_analysis:
-        report_lines.append("PERFORMANCE BY OVERSOLD DEPTH:")
-        report_lines.append("=" * 80)
-        report_lines.append(f"{'Normalized Range':<40} {'Total':<8} {'Wins':<7} {'Win%':<9} {'Avg%':<10} {'Med%':<10}")
-        report_lines.append("-" * 80)
-
-        for stats in normalized_analysis:
-            report_lines.append(
-                f"{stats['range_name']:<40} "
-                f"{stats['total']:<8} "
-                f"{stats['profitable']:<7} "
-                f"{stats['win_rate']:<8.1f}% "
-                f"{stats['avg_pnl']:>8.2f}% "
-                f"{stats['median_pnl']:>8.2f}%"
-            )
-
-        report_lines.append("")
-        report_lines.append("INSIGHT:")
-        deepest = max(normalized_analysis, key=lambda x: x['avg_pnl']) if normalized_analysis else None
-        if deepest:
-            report_lines.append(f"  Best performance: {deepest['range_name']}")
-            report_lines.append(f"  Average return: {deepest['avg_pnl']:+.2f}%")
-            report_lines.append(f"  Win rate: {deepest['win_rate']:.1f}%")
-
-        report_lines.append("=" * 80)
-        report_lines.append("")
-
-    # Top 20 profitable trades
-    report_lines.append("TOP 20 MOST PROFITABLE MAROON TRADES:")
-    report_lines.append("-" * 80)
-    report_lines.append(f"{'Ticker':<8} {'Entry Date':<12} {'Entry $':<10} {'Exit $':<10} {'P&L %':<10} {'Norm Price':<11}")
-    report_lines.append("-" * 80)
-
-    for trade in profitable_trades[:20]:
-        entry_date_str = trade['entry_date'].strftime('%m/%d/%Y')
-        report_lines.append(
-            f"{trade['ticker']:<8} "
-            f"{entry_date_str:<12} "
-            f"${trade['entry_price']:<9.2f} "
-            f"${trade['exit_price']:<9.2f} "
-            f"{trade['pnl_pct']:>8.2f}% "
-            f"{trade['normalized_price']:>10.2f}"
-        )
+    normalized_analysis = analyze_by_normalized_range(trades_df)
+
+    # Top 20 winners (best first) and worst 20 losers (worst last)
+    winners = np.flatnonzero(pnl > 0)
+    losers = np.flatnonzero(pnl <= 0)
+    top_trades = trades_df.iloc[winners[top_n_positions(pnl[winners], 20)]]
+    worst_trades = trades_df.iloc[losers[top_n_positions(-pnl[losers], 20)[::-1]]]
+
+    # Generate report, printing each line and writing it to the report file in one pass
+    with open(output_file, 'w', buffering=1 << 20, encoding='utf-8') as f:
+        def emit(line):
+            print(line)
+            f.write(line)
+            f.write('\n')
+
+        emit("=" * 80)
+        emit("MAROON SIGNAL BACKTEST - EXTREME OVERSOLD RESULTS")
+        emit("=" * 80)
+        emit(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        emit("")
+        emit("STRATEGY:")
+        emit("  Entry: When all 5 conditions are met (MAROON + deep oversold)")
+        emit(f"  Hold: {hold_days} trading days (~1 business quarter)")
+        emit("  Exit: Automatic after hold period")
+        emit("")
+        emit("KEY DIFFERENCE FROM STANDARD TRIPLE SIGNAL:")
+        emit("  - ONLY MAROON signals (not orange)")
+        emit("  - Normalized Price < -0.5 (deep in oversold territory)")
+        emit("  - This catches EXTREME capitulation moments")
+        emit("")
+        emit("=" * 80)
+        emit("OVERALL PERFORMANCE")
+        emit("=" * 80)
+        emit(f"  Total Trades: {total_trades}")
+        emit(f"  Profitable: {profitable} ({win_rate:.1f}%)")
+        emit(f"  Losing: {losing} ({(losing/total_trades*100):.1f}%)")
+        emit("")
+        emit(f"  Average P&L: {avg_pnl:+.2f}%")
+        emit(f"  Median P&L: {median_pnl:+.2f}%")
+        emit(f"  Average P&L ($): ${avg_pnl_dollars:+.2f}")
+        emit(f"  Total P&L ($): ${total_pnl_dollars:+,.2f}")
+        emit("")
+        emit(f"  Best Trade: {best_trade['ticker']} ({best_trade['pnl_pct']:+.2f}%)")
+        emit(f"  Worst Trade: {worst_trade['ticker']} ({worst_trade['pnl_pct']:+.2f}%)")
+        emit("")
+
+        # Portfolio simulation
+        portfolio_size = 1000
+        total_invested = portfolio_size * total_trades
+        total_returns = (pnl / 100 * portfolio_size).sum()
+        portfolio_return_pct = (total_returns / total_invested) * 100
+
+        emit("PORTFOLIO SIMULATION ($1,000 per signal):")
+        emit(f"  Total Invested: ${total_invested:,.2f}")
+        emit(f"  Total Returns: ${total_returns:+,.2f}")
+        emit(f"  Portfolio Return: {portfolio_return_pct:+.2f}%")
+        emit("")
+        emit("=" * 80)
+        emit("")
+
+        # Normalized price depth analysis
+        if normalized_analysis:
+            emit("PERFORMANCE BY OVERSOLD DEPTH:")
+            emit("=" * 80)
+            emit(f"{'Normalized Range':<40} {'Total':<8} {'Wins':<7} {'Win%':<9} {'Avg%':<10} {'Med%':<10}")
+            emit("-" * 80)
+
+            for stats in normalized_analysis:
+                emit(
+                    f"{stats['range_name']:<40} "
+                    f"{stats['total']:<8} "
+                    f"{stats['profitable']:<7} "
+                    f"{stats['win_rate']:<8.1f}% "
+                    f"{stats['avg_pnl']:>8.2f}% "
+                    f"{stats['median_pnl']:>8.2f}%"
+                )
+
+            emit("")
+            emit("INSIGHT:")
+            deepest = max(normalized_analysis, key=lambda x: x['avg_pnl']) if normalized_analysis else None
+            if deepest:
+                emit(f"  Best performance: {deepest['range_name']}")
+                emit(f"  Average return: {deepest['avg_pnl']:+.2f}%")
+                emit(f"  Win rate: {deepest['win_rate']:.1f}%")
+
+            emit("=" * 80)
+            emit("")
+
+        # Top 20 profitable trades
+        emit("TOP 20 MOST PROFITABLE MAROON TRADES:")
+        emit("-" * 80)
+        emit(f"{'Ticker':<8} {'Entry Date':<12} {'Entry $':<10} {'Exit $':<10} {'P&L %':<10} {'Norm Price':<11}")
+        emit("-" * 80)
+
+        for line in format_trade_table(top_trades):
+            emit(line)
+
+        emit("")
+        emit("=" * 80)
+        emit("")
+
+        # Top 20 losing trades
+        emit("TOP 20 WORST MAROON TRADES:")
+        emit("-" * 80)
+        emit(f"{'Ticker':<8} {'Entry Date':<12} {'Entry $':<10} {'Exit $':<10} {'P&L %':<10} {'Norm Price':<11}")
+        emit("-" * 80)
+
+        for line in format_trade_table(worst_trades):
+            emit(line)
+
+        emit("")
+        emit("=" * 80)
+        emit("")
+        emit("ANALYSIS NOTES:")
+        emit("  - Business Quarter = 63 trading days (~3 months)")
+        emit("  - MAROON = Strongest EFI oversold signal (Force Index < -2.0)")
+        emit("  - Normalized Price < -0.5 = Deep oversold (bottom half of range)")
+        emit("  - This catches extreme selling exhaustion in uptrends")
+        emit("  - Each signal treated as independent trade opportunity")
+        emit("  - Does not account for: slippage, commissions, or taxes")
+        emit("")
+        emit("KEY INSIGHTS:")
+        if win_rate > 50:
+            emit(f"  [+] Win rate of {win_rate:.1f}% shows strong edge with MAROON signals")
+        else:
+            emit(f"  [!] Win rate of {win_rate:.1f}% - consider additional filters")
 
-    report_lines.append("")
-    report_lines.append("=" * 80)
-    report_lines.append("")
-
-    # Top 20 losing trades
-    report_lines.append("TOP 20 WORST MAROON TRADES:")
-    report_lines.append("-" * 80)
-    report_lines.append(f"{'Ticker':<8} {'Entry Date':<12} {'Entry $':<10} {'Exit $':<10} {'P&L %':<10} {'Norm Price':<11}")
-    report_lines.append("-" * 80)
-
-    for trade in losing_trades[-20:]:
-        entry_date_str = trade['entry_date'].strftime('%m/%d/%Y')
-        report_lines.append(
-            f"{trade['ticker']:<8} "
-            f"{entry_date_str:<12} "
-            f"${trade['entry_price']:<9.2f} "
-            f"${trade['exit_price']:<9.2f} "
-            f"{trade['pnl_pct']:>8.2f}% "
-            f"{trade['normalized_price']:>10.2f}"
-        )
+        if avg_pnl > 0:
+            emit(f"  [+] Positive average return of {avg_pnl:.2f}% validates deep oversold entry")
+        else:
+            emit(f"  [!] Negative average return of {avg_pnl:.2f}%")
 
-    report_lines.append("")
-    report_lines.append("=" * 80)
-    report_lines.append("")
-    report_lines.append("ANALYSIS NOTES:")
-    report_lines.append("  - Business Quarter = 63 trading days (~3 months)")
-    report_lines.append("  - MAROON = Strongest EFI oversold signal (Force Index < -2.0)")
-    report_lines.append("  - Normalized Price < -0.5 = Deep oversold (bottom half of range)")
-    report_lines.append("  - This catches extreme selling exhaustion in uptrends")
-    report_lines.append("  - Each signal treated as independent trade opportunity")
-    report_lines.append("  - Does not account for: slippage, commissions, or taxes")
-    report_lines.append("")
-    report_lines.append("KEY INSIGHTS:")
-    if win_rate > 50:
-        report_lines.append(f"  [+] Win rate of {win_rate:.1f}% shows strong edge with MAROON signals")
-    else:
-        report_lines.append(f"  [!] Win rate of {win_rate:.1f}% - consider additional filters")
+        if median_pnl > avg_pnl:
+            emit(f"  [!] Median > Average suggests some large losers pulling down average")
+        elif avg_pnl > median_pnl:
+            emit(f"  [+] Average > Median suggests some large winners boosting performance")
+
+        emit("")
+        emit("COMPARISON TO STANDARD TRIPLE SIGNAL:")
+        emit("  Standard (MAROON + ORANGE): More signals, less selective")
+        emit("  MAROON-only with deep oversold: Fewer signals, higher conviction")
+        emit("  Use this data to determine if extreme selectivity improves returns")
 
-    if avg_pnl > 0:
-        report_lines.append(f"  [+] Positive average return of {avg_pnl:.2f}% validates deep oversold entry")
-    else:
-        report_lines.append(f"  [!] Negative average return of {avg_pnl:.2f}%")
-
-    if median_pnl > avg_pnl:
-        report_lines.append(f"  [!] Median > Average suggests some large losers pulling down average")
-    elif avg_pnl > median_pnl:
-        report_lines.append(f"  [+] Average > Median suggests some large winners boosting performance")
-
-    report_lines.append("")
-    report_lines.append("COMPARISON TO STANDARD TRIPLE SIGNAL:")
-    report_lines.append("  Standard (MAROON + ORANGE): More signals, less selective")
-    report_lines.append("  MAROON-only with deep oversold: Fewer signals, higher conviction")
-    report_lines.append("  Use this data to determine if extreme selectivity improves returns")
-    report_lines.append("")
-
-    # Write to file
-    report_text = '\n'.join(report_lines)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(report_text)
-
-    # Print to console
-    print(report_text)
     print(f"Report saved to: {output_file}")
 
 if __name__ == "__main__":
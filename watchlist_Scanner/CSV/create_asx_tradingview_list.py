@@ -2,13 +2,11 @@
 Convert ASXListedCompanies.csv to TradingView ticker list
 """
 
-import pandas as pd
+import csv
 
-# Read the ASX file
-df = pd.read_csv('ASXListedCompanies.csv')
-
-# Get all tickers
-tickers = df['Ticker'].tolist()
+# Read all tickers from the ASX file
+with open('ASXListedCompanies.csv', newline='') as f:
+    tickers = [row['Ticker'] for row in csv.DictReader(f)]
 
 # Create comma-separated list
 tradingview_list = ','.join(tickers)
@@ -16,16 +14,23 @@ tradingview_list = ','.join(tickers)
 # Save to file
 output_file = 'tradingview_asx_list.txt'
 
+header = "=" * 100
+report = "\n".join([
+    header,
+    "TRADINGVIEW ASX TICKER LIST",
+    header,
+    f"Total ASX Companies: {len(tickers)}",
+    "",
+    "Copy and paste the line below into TradingView:",
+    "-" * 100,
+    tradingview_list,
+    "",
+    "",
+])
+
+# Build the whole file in memory and write it once
 with open(output_file, 'w') as f:
-    f.write("=" * 100 + "\n")
-    f.write("TRADINGVIEW ASX TICKER LIST\n")
-    f.write("=" * 100 + "\n")
-    f.write(f"Total ASX Companies: {len(tickers)}\n")
-    f.write("\n")
-    f.write("Copy and paste the line below into TradingView:\n")
-    f.write("-" * 100 + "\n")
-    f.write(tradingview_list + "\n")
-    f.write("\n")
+    f.write(report)
 
 print(f"Created TradingView list with {len(tickers)} ASX tickers")
 print(f"\nFirst 20 tickers: {','.join(tickers[:20])}")
@@ -2,7 +2,11 @@ import pandas as pd
 import numpy as np
 import os
 import talib
+from _njit import njit
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from _cache import cache_dir, cache_key, cached_frame, source_version
+from _prices import read_price_columns
 
 # Directory path
 input_directory = r'watchlist_Scanner\updated_Results_for_scan'
@@ -11,6 +15,18 @@ input_directory = r'watchlist_Scanner\updated_Results_for_scan'
 sorted_output_file_name = "sorted_fader_scan_results.txt"
 sorted_output_file_path = os.path.join('watchlist_Scanner', 'buylist', sorted_output_file_name)
 
+# Parsed price CSVs are cached here as Parquet (when pyarrow is installed)
+price_cache_dir = cache_dir('channel_fader_prices')
+
+# One BUY signal: ticker, event date (mm/dd/yyyy), channel length, close, fader value
+SIGNAL_DTYPE = np.dtype([
+    ('ticker', object),
+    ('date', 'U10'),
+    ('channel_days', np.int64),
+    ('price', np.float64),
+    ('fader_value', np.float64)
+])
+
 # EMA and ATR parameters for channel detection
 ema1_per = 5
 ema2_per = 26
@@ -34,9 +50,20 @@ yesterday = datetime.now() - timedelta(days=1)
 # Minimum trading days for channel formation (reduced to catch more signals)
 min_channel_days = 3  # Just need a channel to be forming, not necessarily 3 weeks
 
-def write_to_sorted_file(text):
-    with open(sorted_output_file_path, 'a') as file:
-        file.write(text + '\n')
+def write_to_sorted_file(lines):
+    with open(sorted_output_file_path, 'w') as file:
+        file.write(''.join(line + '\n' for line in lines))
+
+def load_price_data(ticker_symbol, file_path):
+    """
+    Read a ticker's CSV, caching the parsed data as Parquet.
+    The cache lives in price_cache_dir (when pyarrow is installed) and is
+    rebuilt whenever the CSV or the CSV reader changes.
+    """
+    cache_file = os.path.join(price_cache_dir, f"{ticker_symbol}.parquet")
+    key = cache_key(file_path, source_version(read_price_columns))
+
+    return cached_frame(cache_file, key, lambda: read_price_columns(file_path, date_format='ISO8601'))
 
 def hma(data, period):
     """
@@ -57,20 +84,45 @@ def hma(data, period):
 
     return hma_result
 
-def count_channel_days(SqLup, SqLdn, current_index):
+def count_channel_days(SqLup, SqLdn):
     """
-    Count how many consecutive days a valid channel existed before the current index.
-    A valid channel means both SqLup and SqLdn are not NaN.
+    Count how many consecutive days a valid channel has existed up to each bar.
+    A valid channel means both SqLup and SqLdn (arrays) are not NaN.
+    Returns an array where element j is the channel's run length ending at bar j
+    (0 if there is no channel on bar j).
     """
-    channel_days = 0
-    for j in range(current_index - 1, -1, -1):
-        # Check if both upper and lower channel lines exist
-        if not pd.isna(SqLup.iloc[j]) and not pd.isna(SqLdn.iloc[j]):
-            channel_days += 1
-        else:
-            # Channel broke, stop counting
-            break
-    return channel_days
+    valid = ~np.isnan(SqLup) & ~np.isnan(SqLdn)
+    positions = np.arange(len(valid))
+
+    # Position of the most recent bar without a channel (-1 before the first one)
+    last_break = np.maximum.accumulate(np.where(valid, -1, positions))
+
+    return positions - last_break
+
+@njit(cache=True)
+def jma_recursion(close_prices, alpha, beta, phaseRatio, alpha_sq, one_minus_alpha_sq):
+    """
+    Run the JMA recursion over the close prices (compiled when numba is installed).
+    alpha_sq and one_minus_alpha_sq are pow(alpha, 2) and pow(1 - alpha, 2).
+    Returns the jma_2 series.
+    """
+    n = len(close_prices)
+    jma_2 = np.zeros(n)
+    if n == 0:
+        return jma_2
+
+    e0 = close_prices[0]
+    e1 = 0.0
+    e2 = 0.0
+    jma_2[0] = close_prices[0]
+
+    for i in range(1, n):
+        e0 = (1 - alpha) * close_prices[i] + alpha * e0
+        e1 = (close_prices[i] - e0) * (1 - beta) + beta * e1
+        e2 = (e0 + phaseRatio * e1 - jma_2[i-1]) * one_minus_alpha_sq + alpha_sq * e2
+        jma_2[i] = e2 + jma_2[i-1]
+
+    return jma_2
 
 def calculate_fader(data):
     """
@@ -100,24 +152,9 @@ def calculate_fader(data):
     beta = 0.45 * (length_jma - 1) / (0.45 * (length_jma - 1) + 2)
     alpha = pow(beta, power)
 
-    # Initialize JMA arrays
-    jma_2 = np.zeros(len(close_prices))
-    e0 = np.zeros(len(close_prices))
-    e1 = np.zeros(len(close_prices))
-    e2 = np.zeros(len(close_prices))
-
     # Calculate JMA iteratively (this mimics Pine Script's series behavior)
-    for i in range(len(close_prices)):
-        if i == 0:
-            e0[i] = close_prices[i]
-            e1[i] = 0
-            e2[i] = 0
-            jma_2[i] = close_prices[i]
-        else:
-            e0[i] = (1 - alpha) * close_prices[i] + alpha * e0[i-1]
-            e1[i] = (close_prices[i] - e0[i]) * (1 - beta) + beta * e1[i-1]
-            e2[i] = (e0[i] + phaseRatio * e1[i] - jma_2[i-1]) * pow(1 - alpha, 2) + pow(alpha, 2) * e2[i-1]
-            jma_2[i] = e2[i] + jma_2[i-1]
+    jma_2 = jma_recursion(np.asarray(close_prices, dtype=np.float64), alpha, beta, phaseRatio,
+                          pow(alpha, 2), pow(1 - alpha, 2))
 
     # Calculate final signal (average of MAVW_zl and jma_2)
     signal = (MAVW_zl + jma_2) / 2
@@ -131,51 +168,59 @@ def calculate_fader(data):
 def check_fader_turn_green_yesterday(is_green, current_index):
     """
     Check if fader turned from red to green on the current day (most recent bar).
+    is_green is the fader color as a boolean array.
     Returns True if there was a turn from red to green at current_index.
     """
     if current_index < 1:
         return False
 
     # Check if previous bar was red and current bar is green
-    return not is_green.iloc[current_index - 1] and is_green.iloc[current_index]
+    return not is_green[current_index - 1] and is_green[current_index]
 
-# Clear the sorted output file before starting
-if os.path.exists(sorted_output_file_path):
-    os.remove(sorted_output_file_path)
-
-# Store all signals for sorting
-buy_signals = []
+def scan_one(file_name):
+    """
+    Scan one file in the input directory for the Fader turning green in a channel
+    Returns the file's BUY signals as a list of SIGNAL_DTYPE tuples.
+    """
+    buy_signals = []
 
-# Iterate over the files in the input directory
-for file_name in os.listdir(input_directory):
     try:
         # Skip non-CSV files
         if not file_name.endswith('.csv'):
-            continue
+            return buy_signals
 
         # Input file path for current file
         file_path = os.path.join(input_directory, file_name)
         ticker_symbol = os.path.splitext(file_name)[0]
 
         # Read the existing CSV file
-        data = pd.read_csv(file_path, index_col=0, parse_dates=True, date_format='ISO8601')
+        data = load_price_data(ticker_symbol, file_path)
 
         # Need at least 100 bars for calculations
         if len(data) < 100:
-            continue
+            return buy_signals
 
         # Calculate EMAs and ATR for channel detection
-        ema1 = talib.EMA(data['Close'], timeperiod=ema1_per)
-        ema2 = talib.EMA(data['Close'], timeperiod=ema2_per)
-        atr = talib.ATR(data['High'], data['Low'], data['Close'], timeperiod=atr_per) * atr_mult
+        ema1 = talib.EMA(data['Close'], timeperiod=ema1_per).to_numpy()
+        ema2 = talib.EMA(data['Close'], timeperiod=ema2_per).to_numpy()
+        atr = talib.ATR(data['High'], data['Low'], data['Close'], timeperiod=atr_per).to_numpy() * atr_mult
 
-        # Calculate Squeeze Channel Levels
-        SqLup = (ema2 + atr).where((ema2 - ema1).abs() < atr, float('nan'))
-        SqLdn = (ema2 - atr).where((ema2 - ema1).abs() < atr, float('nan'))
+        # Calculate Squeeze Channel Levels (NaN on bars without a squeeze)
+        in_squeeze = np.abs(ema2 - ema1) < atr
+        SqLup = np.where(in_squeeze, ema2 + atr, np.nan)
+        SqLdn = np.where(in_squeeze, ema2 - atr, np.nan)
 
         # Calculate Fader indicator
         fader_signal, is_green = calculate_fader(data)
 
+        # Consecutive channel days up to each bar
+        channel_runs = count_channel_days(SqLup, SqLdn)
+
+        # Pull the per-bar series out as arrays once so the loop below
+        # indexes plain numpy arrays instead of going through .iloc
+        close = data['Close'].to_numpy()
+        is_green = is_green.to_numpy()
+
         # Check for channel breakouts over last week (focus on recent signals)
         for i in range(3, len(data)):
             date_of_event = pd.Timestamp(data.index[i]).tz_localize(None) if pd.Timestamp(data.index[i]).tzinfo else pd.Timestamp(data.index[i])
@@ -188,42 +233,64 @@ for file_name in os.listdir(input_directory):
             # If fader turned green, check if there's a channel present
             if fader_turned_green:
                 # Check if a channel is currently forming (both upper and lower bounds exist)
-                channel_exists = not pd.isna(SqLup.iloc[i]) and not pd.isna(SqLdn.iloc[i])
+                channel_exists = not np.isnan(SqLup[i]) and not np.isnan(SqLdn[i])
 
                 if channel_exists:
-                    # Count how long the channel has been forming
-                    channel_days = count_channel_days(SqLup, SqLdn, i)
+                    # Count how long the channel has been forming (days before this bar)
+                    channel_days = channel_runs[i - 1]
 
                     # Only proceed if channel existed for minimum required days
                     if channel_days >= min_channel_days:
-                        buy_signals.append({
-                            'ticker': ticker_symbol,
-                            'date': date_of_event.strftime('%m/%d/%Y'),
-                            'channel_days': channel_days,
-                            'price': data['Close'].iloc[i],
-                            'fader_value': round(fader_signal[i], 3)
-                        })
+                        buy_signals.append((
+                            ticker_symbol,
+                            date_of_event.strftime('%m/%d/%Y'),
+                            channel_days,
+                            close[i],
+                            round(fader_signal[i], 3)
+                        ))
 
     except Exception as e:
         print(f"Exception encountered for {ticker_symbol}: {str(e)}")
         print(f"Exception type: {type(e)}")
 
-# Sort buy signals by price (ascending - cheaper stocks first)
-buy_signals.sort(key=lambda x: x['price'])
-
-# Write sorted BUY signals
-write_to_sorted_file("=" * 80)
-write_to_sorted_file(f"FADER GREEN + CHANNEL FORMING SIGNALS ({len(buy_signals)} total)")
-write_to_sorted_file("=" * 80)
-write_to_sorted_file("Conditions: Channel forming (squeeze) + Fader turned RED to GREEN yesterday")
-write_to_sorted_file("Timeframe: Daily | Scanning last week for Fader turning green while in a channel")
-write_to_sorted_file("=" * 80)
-for signal in buy_signals:
-    write_to_sorted_file(f"BUY {signal['ticker']} {signal['date']} : {signal['channel_days']} day channel breakout - Price: {round(signal['price'], 3)} - Fader: {signal['fader_value']}")
-
-write_to_sorted_file("\n" + "=" * 80)
-write_to_sorted_file("Scan process completed")
-write_to_sorted_file("=" * 80)
-
-print(f"\nScan completed! Found {len(buy_signals)} BUY signals with Fader confirmation.")
-print(f"Results saved to: {sorted_output_file_path}")
+    return buy_signals
+
+def compile_kernels():
+    """
+    Compile jma_recursion before starting the process pool, so forked
+    workers inherit it and spawned ones find numba's on-disk cache.
+    """
+    jma_recursion(np.ones(4), 0.5, 0.5, 1.5, 0.25, 0.25)
+
+if __name__ == "__main__":
+    # Store all signals for sorting
+    signal_rows = []
+
+    # Each file is independent, so fan out across CPU cores
+    compile_kernels()
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for file_signals in executor.map(scan_one, os.listdir(input_directory), chunksize=16):
+            signal_rows.extend(file_signals)
+
+    # Sort buy signals by price (ascending - cheaper stocks first, ties kept in scan order)
+    buy_signals = np.array(signal_rows, dtype=SIGNAL_DTYPE)
+    buy_signals = buy_signals[np.argsort(buy_signals['price'], kind='stable')]
+
+    # Write sorted BUY signals (collected here, written in one go below)
+    sorted_lines = []
+    sorted_lines.append("=" * 80)
+    sorted_lines.append(f"FADER GREEN + CHANNEL FORMING SIGNALS ({len(buy_signals)} total)")
+    sorted_lines.append("=" * 80)
+    sorted_lines.append("Conditions: Channel forming (squeeze) + Fader turned RED to GREEN yesterday")
+    sorted_lines.append("Timeframe: Daily | Scanning last week for Fader turning green while in a channel")
+    sorted_lines.append("=" * 80)
+    for signal in buy_signals:
+        sorted_lines.append(f"BUY {signal['ticker']} {signal['date']} : {signal['channel_days']} day channel breakout - Price: {round(signal['price'], 3)} - Fader: {signal['fader_value']}")
+
+    sorted_lines.append("\n" + "=" * 80)
+    sorted_lines.append("Scan process completed")
+    sorted_lines.append("=" * 80)
+    write_to_sorted_file(sorted_lines)
+
+    print(f"\nScan completed! Found {len(buy_signals)} BUY signals with Fader confirmation.")
+    print(f"Results saved to: {sorted_output_file_path}")
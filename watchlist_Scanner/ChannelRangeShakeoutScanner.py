@@ -13,221 +13,628 @@ This combines channel detection with range level theory.
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial, reduce
+from _njit import njit, NUMBA_AVAILABLE
+from _cache import cache_dir, cache_key, read_cached_table, source_version, write_cached_table
+
+# Optional: pyarrow's CSV reader is much faster than pandas for clean files
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional: polars' lazy CSV scan is faster still
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 results_dir = os.path.join(script_dir, 'updated_Results_for_scan')
 buylist_dir = os.path.join(script_dir, 'buylist')
 output_file = os.path.join(buylist_dir, 'channel_range_shakeout_results.txt')
+price_cache_dir = cache_dir('shakeout_prices')
+scan_index_file = os.path.join(price_cache_dir, '_index.parquet')
+
+# Range levels a channel can form at, in the order they are checked
+CHANNEL_LEVELS = ['L25', 'L50', 'L75']
+
+# Columns of the setups array returned by find_shakeout_setups (after 'ticker')
+SETUP_FIELDS = [
+    ('current_price', 'f8'), ('date', 'datetime64[ns]'),
+    ('L0', 'f8'), ('L25', 'f8'), ('L50', 'f8'), ('L75', 'f8'), ('L100', 'f8'),
+    ('shakeout_low', 'f8'), ('channel_level', 'i1'), ('position_pct', 'f8'),
+    ('recovery_pct', 'f8'), ('entry', 'f8'), ('stop', 'f8'), ('target', 'f8'),
+    ('rr_ratio', 'f8'), ('quality', 'u1'), ('notes_mask', 'u2')
+]
+
+# Bits of a setup's notes_mask, decoded into text by format_notes
+NOTE_CHANNEL = 1 << 0
+NOTE_SHAKEOUT_BELOW = 1 << 1
+NOTE_TOUCHED = 1 << 2
+NOTE_STRONG_RECOVERY = 1 << 3
+NOTE_CLASSIC_L25 = 1 << 4
+
+# Price bands (under $10, $10-100, $100-500, $500+) and the range size used in each
+RANGE_BREAKS = np.array([10.0, 100.0, 500.0])
+RANGE_SIZES = np.array([1.0, 10.0, 50.0, 100.0])
+
+# Setup thresholds, as fractions of the range size unless noted
+CHANNEL_LEVEL_FRACTIONS = np.array([0.25, 0.50, 0.75])  # L25, L50, L75
+CHANNEL_MAX_RANGE = 0.20  # Channel high - low must fit within this
+CHANNEL_LEVEL_TOLERANCE = 0.10  # Channel average must be this close to a level
+L0_TOUCH_TOLERANCE = 1.02  # Low within 2% above L0 counts as touching it
+STOP_BUFFER = 0.02  # Stop sits this far below L0
+STRONG_RECOVERY_PCT = 10  # Recovery off the low, in % of the range
+
+
+def compute_range_levels(prices):
+    """
+    Get the range (see RANGE_BREAKS / RANGE_SIZES) each of an array of prices falls in.
 
+    Returns:
+        (range_low, range_size) arrays; both are NaN where price <= 0
+    """
+    range_size = RANGE_SIZES[np.searchsorted(RANGE_BREAKS, prices, side='right')]
+    range_low = np.floor(prices / range_size) * range_size
 
-def get_range_info(price):
-    """Get range levels for a price"""
-    if price <= 0:
-        return None
+    invalid = ~(prices > 0)
+    range_low[invalid] = np.nan
+    range_size[invalid] = np.nan
 
-    if price < 10:
-        range_size = 1.0
-        range_low = int(price)
-    elif price < 100:
-        range_size = 10.0
-        range_low = int(price / 10) * 10
-    elif price < 500:
-        range_size = 50.0
-        range_low = int(price / 50) * 50
-    else:
-        range_size = 100.0
-        range_low = int(price / 100) * 100
-
-    return {
-        'range_low': range_low,
-        'range_high': range_low + range_size,
-        'range_size': range_size,
-        'L0': range_low,
-        'L25': range_low + (range_size * 0.25),
-        'L50': range_low + (range_size * 0.50),
-        'L75': range_low + (range_size * 0.75),
-        'L100': range_low + range_size
-    }
-
-
-def detect_channel_at_level(prices, range_info, lookback=15):
-    """
-    Detect if price was consolidating near a range level.
-    Returns the level it was consolidating near (L25, L50, L75) or None.
+    return range_low, range_size
+
+
+def detect_channel_at_level(channel_prices, range_size, levels):
     """
-    if len(prices) < lookback:
-        return None, 0
+    Detect which tickers were consolidating near a range level.
+
+    Args:
+        channel_prices: (n_tickers, lookback) array of closes in the channel window
+        range_size: (n_tickers,) array of range sizes
+        levels: (n_tickers, 3) array of the L25, L50, L75 prices
 
-    channel_prices = prices[-lookback:]
-    avg_price = np.mean(channel_prices)
-    price_range = max(channel_prices) - min(channel_prices)
-    range_size = range_info['range_size']
+    Returns:
+        (n_tickers,) int array: index into CHANNEL_LEVELS of the level each
+        ticker was consolidating near, or -1 for no channel
+    """
+    avg_price = channel_prices.mean(axis=1)
+    price_range = channel_prices.max(axis=1) - channel_prices.min(axis=1)
 
     # Check if price range is tight (consolidation) - less than 15% of range
-    if price_range > range_size * 0.20:
-        return None, 0
-
-    # Check which level the consolidation was near
-    levels = [
-        ('L25', range_info['L25']),
-        ('L50', range_info['L50']),
-        ('L75', range_info['L75']),
-    ]
+    tight = price_range <= range_size * CHANNEL_MAX_RANGE
 
-    for level_name, level_price in levels:
-        # If average was within 5% of range from level
-        if abs(avg_price - level_price) <= range_size * 0.10:
-            channel_tightness = 1 - (price_range / (range_size * 0.20))  # 0 to 1
-            return level_name, channel_tightness
+    # If average was within 5% of range from level (first matching level wins)
+    near_level = np.abs(avg_price[:, None] - levels) <= (range_size * CHANNEL_LEVEL_TOLERANCE)[:, None]
+    channel_level = np.where(near_level.any(axis=1), near_level.argmax(axis=1), -1)
 
-    return None, 0
+    return np.where(tight, channel_level, -1)
 
 
-def find_shakeout_setup(ticker, results_dir, channel_lookback=15, shakeout_lookback=10):
+def read_recent_prices_polars(csv_file, window, min_data):
     """
-    Find the channel + range shakeout setup:
-    1. Was consolidating in a channel near a range level
-    2. Recently dropped to touch 0% level (shakeout)
-    3. Now recovering
+    Fast path for load_recent_prices using a polars lazy CSV scan.
+
+    Raises a polars error when a value can't be converted (e.g. a stray
+    non-date row), so the caller can fall back to a more forgiving reader.
     """
-    csv_file = os.path.join(results_dir, f"{ticker}.csv")
+    lf = pl.scan_csv(
+        csv_file,
+        skip_rows_after_header=2,
+        schema_overrides={col: pl.Float64 for col in ['Open', 'High', 'Low', 'Close']}
+    )
 
-    if not os.path.exists(csv_file):
+    if 'Price' in lf.collect_schema().names():
+        lf = lf.rename({'Price': 'Date'})
+
+    required_cols = ['Date', 'Open', 'High', 'Low', 'Close']
+    if not all(col in lf.collect_schema().names() for col in required_cols):
         return None
 
-    try:
-        df = pd.read_csv(csv_file, skiprows=[1, 2])
+    # drop_nans() as well, since a literal NaN in a float column isn't a null
+    df = (
+        lf.drop_nulls()
+        .drop_nans()
+        .select(pl.col('Date').str.to_datetime(time_zone='UTC'), 'Low', 'Close')
+        .collect()
+    )
+
+    # Need enough data
+    if df.height < min_data:
+        return None
+
+    # Files are written oldest first, so only sort when they aren't
+    if not df['Date'].is_sorted():
+        df = df.sort('Date')
+
+    recent = df.tail(window)
+
+    return pd.Timestamp(recent['Date'][-1]), recent['Low'].to_numpy(), recent['Close'].to_numpy()
+
+
+def read_recent_prices_pyarrow(csv_file, window, min_data):
+    """
+    Fast path for load_recent_prices using the pyarrow CSV reader.
+
+    Raises pyarrow.ArrowInvalid when a value can't be converted (e.g. a stray
+    non-date row), so the caller can fall back to the more forgiving pandas path.
+    """
+    timestamp = pa.timestamp('ns', tz='UTC')
+    column_types = {'Date': timestamp, 'Price': timestamp}
+    column_types.update({col: pa.float64() for col in ['Open', 'High', 'Low', 'Close']})
+
+    table = pacsv.read_csv(
+        csv_file,
+        read_options=pacsv.ReadOptions(skip_rows_after_names=2),
+        convert_options=pacsv.ConvertOptions(column_types=column_types)
+    )
+
+    if 'Price' in table.column_names:
+        table = table.rename_columns(['Date' if name == 'Price' else name for name in table.column_names])
+
+    required_cols = ['Date', 'Open', 'High', 'Low', 'Close']
+    if not all(col in table.column_names for col in required_cols):
+        return None
+
+    table = table.drop_null()
+
+    # Spellings like 'NAN' aren't in pyarrow's null values and come through
+    # as real NaNs, so drop those rows too, as the pandas path's dropna() does
+    not_nan = [pc.invert(pc.is_nan(table.column(col))) for col in ['Open', 'High', 'Low', 'Close']]
+    table = table.filter(reduce(pc.and_, not_nan))
 
-        if 'Price' in df.columns:
-            df.rename(columns={'Price': 'Date'}, inplace=True)
+    # Need enough data
+    if table.num_rows < min_data:
+        return None
+
+    # Files are written oldest first, so only sort when they aren't
+    dates = table.column('Date').to_numpy()
+    if (dates[1:] < dates[:-1]).any():
+        table = table.sort_by('Date')
+
+    table = table.slice(table.num_rows - window)
+
+    return (
+        pd.Timestamp(table.column('Date')[-1].as_py()),
+        table.column('Low').to_numpy(),
+        table.column('Close').to_numpy()
+    )
+
+
+def read_recent_prices_pandas(csv_file, window, min_data):
+    """Pandas path for load_recent_prices - coerces unparseable values and drops them"""
+    df = pd.read_csv(csv_file, skiprows=[1, 2])
+
+    if 'Price' in df.columns:
+        df.rename(columns={'Price': 'Date'}, inplace=True)
+
+    required_cols = ['Date', 'Open', 'High', 'Low', 'Close']
+    if not all(col in df.columns for col in required_cols):
+        return None
+
+    for col in ['Open', 'High', 'Low', 'Close']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
 
-        required_cols = ['Date', 'Open', 'High', 'Low', 'Close']
-        if not all(col in df.columns for col in required_cols):
-            return None
+    df = df.dropna()
 
+    # Files are written oldest first, so normally only the dates of the rows
+    # used need parsing. Parse and sort everything only when the raw date
+    # strings are out of order or a used row has an unparseable date.
+    recent = df.tail(window)
+    recent_dates = pd.to_datetime(recent['Date'], utc=True, errors='coerce')
+
+    if not (df['Date'].is_monotonic_increasing and recent_dates.notna().all()):
         df['Date'] = pd.to_datetime(df['Date'], utc=True, errors='coerce')
         df = df.dropna(subset=['Date'])
         df = df.sort_values('Date')
+        recent = df.tail(window)
+        recent_dates = recent['Date']
+
+    # Need enough data
+    if len(df) < min_data:
+        return None
+
+    return recent_dates.iloc[-1], recent['Low'].to_numpy(dtype=np.float64), recent['Close'].to_numpy(dtype=np.float64)
+
+
+def read_recent_prices(csv_file, window, min_data):
+    """Parse a ticker's recent bars with the fastest reader that can handle the file"""
+    if POLARS_AVAILABLE:
+        try:
+            return read_recent_prices_polars(csv_file, window, min_data)
+        except pl.exceptions.PolarsError:
+            pass  # Messy file - try the other readers
+
+    if PYARROW_AVAILABLE:
+        try:
+            return read_recent_prices_pyarrow(csv_file, window, min_data)
+        except pa.ArrowInvalid:
+            pass  # Messy file - let pandas coerce the bad values
+
+    return read_recent_prices_pandas(csv_file, window, min_data)
+
+
+def load_price_cache(cache_file, key):
+    """
+    Read a ticker's cached recent bars.
+
+    Returns:
+        (hit, recent) - hit is False when there is no cache or it was built
+        with a different key; recent is as from load_recent_prices
+    """
+    table = read_cached_table(cache_file, key)
+
+    if table is None:
+        return False, None
+
+    if table.num_rows == 0:
+        return True, None
+
+    return True, (
+        pd.Timestamp(table.schema.metadata[b'date'].decode()),
+        table.column('Low').to_numpy(),
+        table.column('Close').to_numpy()
+    )
+
+
+def save_price_cache(cache_file, key, recent):
+    """Write a ticker's recent bars (or None) to the price cache"""
+    metadata = {}
+
+    if recent:
+        metadata['date'] = recent[0].isoformat()
+        lows, closes = recent[1], recent[2]
+    else:
+        lows = closes = np.empty(0)
+
+    table = pa.table({'Low': lows, 'Close': closes}).replace_schema_metadata(metadata)
+    write_cached_table(cache_file, key, table, compression='zstd')
+
 
-        for col in ['Open', 'High', 'Low', 'Close']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        df = df.dropna()
-
-        # Need enough data
-        min_data = channel_lookback + shakeout_lookback + 5
-        if len(df) < min_data:
-            return None
-
-        # Get recent data
-        df = df.tail(50)
-
-        current_price = df['Close'].iloc[-1]
-        current_date = df['Date'].iloc[-1]
-
-        # Get range info based on current price
-        range_info = get_range_info(current_price)
-        if range_info is None:
-            return None
-
-        # Step 1: Check for prior channel/consolidation (before recent action)
-        # Look at prices from channel_lookback+shakeout_lookback to shakeout_lookback ago
-        channel_start = -(channel_lookback + shakeout_lookback)
-        channel_end = -shakeout_lookback
-
-        if abs(channel_start) > len(df):
-            return None
-
-        channel_prices = df['Close'].iloc[channel_start:channel_end].values
-
-        # Check if there was a channel near a range level
-        channel_level, channel_tightness = detect_channel_at_level(
-            channel_prices, range_info, lookback=channel_lookback
-        )
-
-        # Step 2: Check for shakeout (drop to 0% level) in recent days
-        recent_lows = df['Low'].iloc[-shakeout_lookback:].values
-        shakeout_low = min(recent_lows)
-
-        # Did price touch or go below the 0% level?
-        touched_L0 = shakeout_low <= range_info['L0'] * 1.02  # 2% tolerance
-        went_below_L0 = shakeout_low < range_info['L0']
-
-        if not touched_L0:
-            return None
-
-        # Step 3: Check for recovery - current price back above L0
-        recovering = current_price > range_info['L0']
-        recovery_strength = (current_price - shakeout_low) / range_info['range_size'] * 100
-
-        if not recovering:
-            return None
-
-        # Calculate setup quality
-        quality = 0
-        notes = []
-
-        if channel_level:
-            quality += 2
-            notes.append(f"Channel at {channel_level}")
-
-        if went_below_L0:
-            quality += 2
-            notes.append("Shakeout below L0")
-        elif touched_L0:
-            quality += 1
-            notes.append("Touched L0")
-
-        if recovery_strength > 10:
-            quality += 1
-            notes.append(f"Strong recovery ({recovery_strength:.0f}%)")
-
-        # Current position in range
-        position_in_range = (current_price - range_info['L0']) / range_info['range_size'] * 100
-
-        # Best setups: was at L25 channel, shook out to L0, now recovering
-        if channel_level == 'L25' and went_below_L0:
-            quality += 2
-            notes.append("CLASSIC L25 SHAKEOUT")
-
-        if quality < 2:
-            return None
-
-        # Calculate trade levels
-        entry = current_price
-        stop = range_info['L0'] - (range_info['range_size'] * 0.02)  # Just below L0
-        target = range_info['L75']
-
-        risk = entry - stop
-        reward = target - entry
-        rr_ratio = reward / risk if risk > 0 else 0
-
-        return {
-            'ticker': ticker,
-            'current_price': current_price,
-            'date': current_date,
-            'range': f"${range_info['L0']:.0f}-${range_info['L100']:.0f}",
-            'L0': range_info['L0'],
-            'L25': range_info['L25'],
-            'L50': range_info['L50'],
-            'L75': range_info['L75'],
-            'shakeout_low': shakeout_low,
-            'channel_level': channel_level or 'None',
-            'position_pct': position_in_range,
-            'recovery_pct': recovery_strength,
-            'entry': entry,
-            'stop': stop,
-            'target': target,
-            'rr_ratio': rr_ratio,
-            'quality': quality,
-            'notes': ', '.join(notes)
-        }
+def load_recent_prices(csv_file, window, min_data):
+    """
+    Read a ticker's CSV and return its most recent bars.
+
+    Results are cached per ticker as Parquet in price_cache_dir (when
+    pyarrow is available), keyed on the CSV's mtime and size, the reader
+    code and the window, so unchanged files skip CSV parsing on later runs.
+
+    Returns:
+        (current_date, lows, closes) for the last `window` bars, or None if the
+        file is unreadable, malformed, or has fewer than `min_data` clean rows
+    """
+    try:
+        if not PYARROW_AVAILABLE:
+            return read_recent_prices(csv_file, window, min_data)
+
+        key = cache_key(csv_file, source_version(read_recent_prices), window, min_data)
+        cache_file = os.path.join(price_cache_dir, os.path.basename(csv_file)[:-4] + '.parquet')
+
+        hit, recent = load_price_cache(cache_file, key)
+        if not hit:
+            recent = read_recent_prices(csv_file, window, min_data)
+            save_price_cache(cache_file, key, recent)
+
+        return recent
 
     except Exception as e:
         return None
 
 
+@njit(cache=True)
+def _score_setups_numba(lows, closes, range_low, range_size, channel_lookback, shakeout_lookback):
+    """Compiled per-ticker version of _score_setups_numpy (same inputs and outputs)"""
+    n, width = closes.shape
+    channel_level = np.full(n, -1, dtype=np.int64)
+    shakeout_low = np.full(n, np.nan)
+    recovery_strength = np.full(n, np.nan)
+    quality = np.zeros(n, dtype=np.int64)
+
+    for i in range(n):
+        # NaN ranges (price <= 0) fail every comparison below, so they score 0
+        L0 = range_low[i]
+        size = range_size[i]
+        current_price = closes[i, width - 1]
+        level_tolerance = size * CHANNEL_LEVEL_TOLERANCE
+
+        # Step 1: Prior channel near L25 / L50 / L75
+        # (sum, high and low of the channel in one pass)
+        total = 0.0
+        channel_high = -np.inf
+        channel_low = np.inf
+        for j in range(channel_lookback):
+            price = closes[i, j]
+            total += price
+            if price > channel_high:
+                channel_high = price
+            if price < channel_low:
+                channel_low = price
+        avg_price = total / channel_lookback
+        if channel_high - channel_low <= size * CHANNEL_MAX_RANGE:
+            for k in range(3):
+                if abs(avg_price - (L0 + size * CHANNEL_LEVEL_FRACTIONS[k])) <= level_tolerance:
+                    channel_level[i] = k
+                    break
+
+        # Step 2: Shakeout to L0 in recent days
+        low = lows[i, width - shakeout_lookback:].min()
+        shakeout_low[i] = low
+        recovery_strength[i] = (current_price - low) / size * 100
+
+        # Step 3: Must have touched L0 and be recovering
+        if not (low <= L0 * L0_TOUCH_TOLERANCE and current_price > L0):
+            continue
+
+        q = 0
+        if channel_level[i] >= 0:
+            q += 2
+        if low < L0:
+            q += 2
+            if channel_level[i] == 0:
+                q += 2  # Classic L25 shakeout
+        else:
+            q += 1
+        if recovery_strength[i] > STRONG_RECOVERY_PCT:
+            q += 1
+        quality[i] = q
+
+    return channel_level, shakeout_low, recovery_strength, quality
+
+
+def _score_setups_numpy(lows, closes, range_low, range_size, channel_lookback, shakeout_lookback):
+    """
+    Score every ticker in the batch for the channel + range shakeout setup.
+
+    Args:
+        lows, closes: (n_tickers, channel_lookback + shakeout_lookback) arrays
+        range_low, range_size: (n_tickers,) arrays from compute_range_levels
+
+    Returns:
+        (channel_level, shakeout_low, recovery_strength, quality) arrays, with
+        quality 0 for tickers that didn't touch L0 and recover above it
+    """
+    current_price = closes[:, -1]
+    levels = range_low[:, None] + range_size[:, None] * CHANNEL_LEVEL_FRACTIONS
+
+    # Step 1: Check for prior channel/consolidation (before recent action)
+    # Look at prices from channel_lookback+shakeout_lookback to shakeout_lookback ago
+    channel_level = detect_channel_at_level(closes[:, :channel_lookback], range_size, levels)
+    has_channel = channel_level >= 0
+
+    # Step 2: Check for shakeout (drop to 0% level) in recent days
+    shakeout_low = lows[:, -shakeout_lookback:].min(axis=1)
+
+    # Did price touch or go below the 0% level?
+    touched_L0 = shakeout_low <= range_low * L0_TOUCH_TOLERANCE
+    went_below_L0 = shakeout_low < range_low
+
+    # Step 3: Check for recovery - current price back above L0
+    recovering = current_price > range_low
+    recovery_strength = (current_price - shakeout_low) / range_size * 100
+
+    # Best setups: was at L25 channel, shook out to L0, now recovering
+    classic = (channel_level == 0) & went_below_L0
+
+    # Calculate setup quality
+    quality = (
+        2 * has_channel
+        + np.where(went_below_L0, 2, np.where(touched_L0, 1, 0))
+        + (recovery_strength > STRONG_RECOVERY_PCT)
+        + 2 * classic
+    )
+
+    return channel_level, shakeout_low, recovery_strength, np.where(touched_L0 & recovering, quality, 0)
+
+
+# Use the compiled kernel when numba is installed
+score_setups = _score_setups_numba if NUMBA_AVAILABLE else _score_setups_numpy
+
+
+def find_shakeout_setups(tickers, dates, lows, closes, channel_lookback=15, shakeout_lookback=10):
+    """
+    Find the channel + range shakeout setup across a batch of tickers:
+    1. Was consolidating in a channel near a range level
+    2. Recently dropped to touch 0% level (shakeout)
+    3. Now recovering
+
+    Args:
+        tickers: List of ticker symbols
+        dates: List of each ticker's most recent bar date
+        lows, closes: (n_tickers, channel_lookback + shakeout_lookback) arrays
+            of each ticker's most recent bars, oldest first
+
+    Returns:
+        Structured array with one SETUP_FIELDS row (plus 'ticker') per
+        matched setup, in ticker order
+    """
+    current_price = closes[:, -1]
+
+    # Get range info based on current price
+    range_low, range_size = compute_range_levels(current_price)
+
+    channel_level, shakeout_low, recovery_strength, quality = score_setups(
+        lows, closes, range_low, range_size, channel_lookback, shakeout_lookback
+    )
+
+    matched = np.flatnonzero(quality >= 2)
+    L0 = range_low[matched]
+    size = range_size[matched]
+    entry = current_price[matched]
+
+    # One row per matched setup, columns filled for all matches at once
+    tickers = np.asarray(tickers)
+    setups = np.empty(len(matched), dtype=[('ticker', tickers.dtype)] + SETUP_FIELDS)
+    setups['ticker'] = tickers[matched]
+    setups['current_price'] = entry
+    setups['date'] = pd.DatetimeIndex(dates)[matched].tz_convert(None).values
+    setups['L0'] = L0
+    setups['L25'] = L0 + size * 0.25
+    setups['L50'] = L0 + size * 0.50
+    setups['L75'] = L0 + size * 0.75
+    setups['L100'] = L0 + size
+    setups['shakeout_low'] = shakeout_low[matched]
+    setups['channel_level'] = channel_level[matched]
+    setups['position_pct'] = (entry - L0) / size * 100  # Current position in range
+    setups['recovery_pct'] = recovery_strength[matched]
+    setups['quality'] = quality[matched]
+
+    # Calculate trade levels
+    stop = L0 - (size * STOP_BUFFER)  # Just below L0
+    target = setups['L75']
+    risk = entry - stop
+    reward = target - entry
+
+    setups['entry'] = entry
+    setups['stop'] = stop
+    setups['target'] = target
+    setups['rr_ratio'] = np.divide(reward, risk, out=np.zeros(len(matched)), where=risk > 0)
+
+    has_channel = setups['channel_level'] >= 0
+    went_below_L0 = setups['shakeout_low'] < L0
+    setups['notes_mask'] = (
+        np.where(has_channel, NOTE_CHANNEL, 0)
+        | np.where(went_below_L0, NOTE_SHAKEOUT_BELOW, NOTE_TOUCHED)
+        | np.where(setups['recovery_pct'] > STRONG_RECOVERY_PCT, NOTE_STRONG_RECOVERY, 0)
+        | np.where((setups['channel_level'] == 0) & went_below_L0, NOTE_CLASSIC_L25, 0)
+    )
+
+    return setups
+
+
+def scan_batch(tickers, csv_files, channel_lookback=15, shakeout_lookback=10):
+    """
+    Load and score one batch of tickers (runs in a worker process).
+
+    Args:
+        tickers: Array of ticker symbols
+        csv_files: Matching list of CSV paths
+
+    Returns:
+        (setups, last_close, shakeout_low) - the batch's setups as from
+        find_shakeout_setups, plus each ticker's last close and shakeout low
+        for the scan index (NaN where the ticker couldn't be loaded)
+    """
+    window = channel_lookback + shakeout_lookback
+    min_data = window + 5
+
+    # Loading is mostly file I/O, so threads overlap the reads
+    load = partial(load_recent_prices, window=window, min_data=min_data)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        loaded = [(i, recent) for i, recent in enumerate(executor.map(load, csv_files)) if recent]
+
+    last_close = np.full(len(tickers), np.nan)
+    shakeout_low = np.full(len(tickers), np.nan)
+
+    if not loaded:
+        return np.empty(0, dtype=[('ticker', tickers.dtype)] + SETUP_FIELDS), last_close, shakeout_low
+
+    loaded_idx = [i for i, _ in loaded]
+    lows = np.vstack([recent[1] for _, recent in loaded])
+    closes = np.vstack([recent[2] for _, recent in loaded])
+    last_close[loaded_idx] = closes[:, -1]
+    shakeout_low[loaded_idx] = lows[:, -shakeout_lookback:].min(axis=1)
+
+    setups = find_shakeout_setups(
+        tickers[loaded_idx], [recent[0] for _, recent in loaded], lows, closes,
+        channel_lookback=channel_lookback, shakeout_lookback=shakeout_lookback
+    )
+    return setups, last_close, shakeout_low
+
+
+def rules_out_setup(last_close, shakeout_low):
+    """
+    True where a ticker's last close and shakeout low already rule out a
+    setup (L0 not touched, or price not back above L0) - the same test
+    score_setups applies, so skipping these tickers never drops a setup
+    """
+    range_low, _ = compute_range_levels(last_close)
+    return ~((shakeout_low <= range_low * L0_TOUCH_TOLERANCE) & (last_close > range_low))
+
+
+def load_scan_index(tickers, mtime_ns, sizes, params):
+    """
+    Look up tickers in the scan index from the previous run.
+
+    Returns:
+        (known, last_close, shakeout_low) arrays aligned with tickers - known
+        is False where the ticker isn't indexed or its CSV has changed since
+    """
+    n = len(tickers)
+    table = read_cached_table(scan_index_file, params)
+    if table is None:
+        return np.zeros(n, dtype=bool), np.full(n, np.nan), np.full(n, np.nan)
+
+    current = pd.DataFrame({'ticker': tickers, 'mtime_ns': mtime_ns, 'size': sizes})
+    merged = current.merge(table.to_pandas(), on=['ticker', 'mtime_ns', 'size'], how='left', indicator=True)
+
+    return (
+        (merged['_merge'] == 'both').to_numpy(),
+        merged['last_close'].to_numpy(dtype=np.float64, copy=True),
+        merged['shakeout_low'].to_numpy(dtype=np.float64, copy=True)
+    )
+
+
+def save_scan_index(tickers, mtime_ns, sizes, last_close, shakeout_low, params):
+    """Write every ticker's CSV version, last close and shakeout low to the scan index"""
+    table = pa.table({
+        'ticker': tickers,
+        'mtime_ns': mtime_ns,
+        'size': sizes,
+        'last_close': last_close,
+        'shakeout_low': shakeout_low
+    })
+    write_cached_table(scan_index_file, params, table)
+
+
+def channel_label(channel_level):
+    """Name of a channel_level code ('None' for no channel)"""
+    return CHANNEL_LEVELS[channel_level] if channel_level >= 0 else 'None'
+
+
+def format_notes(setup):
+    """Notes text for a setup, decoded from its notes_mask"""
+    mask = setup['notes_mask']
+    notes = []
+
+    if mask & NOTE_CHANNEL:
+        notes.append(f"Channel at {channel_label(setup['channel_level'])}")
+    if mask & NOTE_SHAKEOUT_BELOW:
+        notes.append("Shakeout below L0")
+    if mask & NOTE_TOUCHED:
+        notes.append("Touched L0")
+    if mask & NOTE_STRONG_RECOVERY:
+        notes.append(f"Strong recovery ({setup['recovery_pct']:.0f}%)")
+    if mask & NOTE_CLASSIC_L25:
+        notes.append("CLASSIC L25 SHAKEOUT")
+
+    return ', '.join(notes)
+
+
+def format_rows(fmt, *columns):
+    """
+    Format report table rows from whole columns.
+
+    Args:
+        fmt: printf-style format for a whole row (one specifier per column)
+        *columns: Equal-length column arrays
+
+    Returns:
+        List of formatted lines
+    """
+    return [fmt % row for row in zip(*columns)]
+
+
+def range_label(setup):
+    """Range of a setup formatted like $40-$50"""
+    return f"${setup['L0']:.0f}-${setup['L100']:.0f}"
+
+
 def run_scanner():
     """Run the channel + range shakeout scanner"""
     print("=" * 100)
@@ -244,35 +651,81 @@ def run_scanner():
     print("=" * 100)
     print()
 
-    csv_files = [f for f in os.listdir(results_dir) if f.endswith('.csv')]
-    tickers = [f[:-4] for f in csv_files]
+    with os.scandir(results_dir) as entries:
+        csv_entries = [(entry.name[:-4], entry.path) for entry in entries if entry.name.endswith('.csv') and entry.is_file()]
+    tickers = [ticker for ticker, _ in csv_entries]
+    csv_files = [csv_file for _, csv_file in csv_entries]
 
     print(f"Scanning {len(tickers)} stocks...")
 
-    all_setups = []
-
-    for i, ticker in enumerate(tickers):
-        if (i + 1) % 500 == 0:
-            print(f"  Progress: {i + 1}/{len(tickers)}...")
+    channel_lookback = 15
+    shakeout_lookback = 10
+    params = f"{source_version(__file__)}_{channel_lookback}_{shakeout_lookback}"
+
+    ticker_array = np.asarray(tickers)
+    file_stats = [os.stat(csv_file) for csv_file in csv_files]
+    mtime_ns = np.array([stat.st_mtime_ns for stat in file_stats], dtype=np.int64)
+    sizes = np.array([stat.st_size for stat in file_stats], dtype=np.int64)
+
+    # Unchanged tickers whose last close and shakeout low already rule out a
+    # setup don't need their CSV (or price cache) opened at all
+    to_scan = np.ones(len(tickers), dtype=bool)
+    last_close = np.full(len(tickers), np.nan)
+    shakeout_low = np.full(len(tickers), np.nan)
+
+    if PYARROW_AVAILABLE and tickers:
+        known, last_close, shakeout_low = load_scan_index(ticker_array, mtime_ns, sizes, params)
+        to_scan = ~(known & rules_out_setup(last_close, shakeout_low))
+
+        if not to_scan.all():
+            print(f"  Skipping {np.count_nonzero(~to_scan)} unchanged stocks with no possible setup")
+
+    scan_idx = np.flatnonzero(to_scan)
+
+    # Split the tickers into batches and load + score them in worker
+    # processes, so the CPU-bound parsing and scoring use every core
+    if len(scan_idx):
+        n_batches = min(len(scan_idx), (os.cpu_count() or 1) * 4)
+        bounds = np.linspace(0, len(scan_idx), n_batches + 1).astype(int)
+        batches = [scan_idx[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        scan = partial(scan_batch, channel_lookback=channel_lookback, shakeout_lookback=shakeout_lookback)
+
+        batch_setups = []
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(
+                scan,
+                [ticker_array[batch] for batch in batches],
+                [[csv_files[i] for i in batch] for batch in batches]
+            )
+            for start, end, batch, (setups, batch_close, batch_low) in zip(bounds[:-1], bounds[1:], batches, results):
+                if end // 500 > start // 500:
+                    print(f"  Progress: {end}/{len(scan_idx)}...")
+                batch_setups.append(setups)
+                last_close[batch] = batch_close
+                shakeout_low[batch] = batch_low
+
+        all_setups = np.concatenate(batch_setups)
+    else:
+        all_setups = []
 
-        setup = find_shakeout_setup(ticker, results_dir)
-        if setup:
-            all_setups.append(setup)
+    if PYARROW_AVAILABLE and tickers:
+        save_scan_index(ticker_array, mtime_ns, sizes, last_close, shakeout_low, params)
 
     print()
     print(f"Found {len(all_setups)} channel + range shakeout setups")
     print()
 
-    if not all_setups:
+    if len(all_setups) == 0:
         print("No setups found matching criteria.")
         return
 
-    # Sort by quality
-    all_setups.sort(key=lambda x: (x['quality'], x['rr_ratio']), reverse=True)
+    # Sort by quality, then R:R (both descending, ties keep ticker order)
+    all_setups = all_setups[np.lexsort((-all_setups['rr_ratio'], -all_setups['quality'].astype(np.int64)))]
 
     # Separate by type
-    classic_setups = [s for s in all_setups if 'CLASSIC L25 SHAKEOUT' in s['notes']]
-    other_setups = [s for s in all_setups if 'CLASSIC L25 SHAKEOUT' not in s['notes']]
+    is_classic = (all_setups['notes_mask'] & NOTE_CLASSIC_L25) != 0
+    classic_setups = all_setups[is_classic]
+    other_setups = all_setups[~is_classic]
 
     # Generate report
     report_lines = []
@@ -294,23 +747,24 @@ def run_scanner():
     report_lines.append("")
 
     # Classic L25 shakeouts (best setups)
-    if classic_setups:
+    if len(classic_setups):
         report_lines.append("[BEST] CLASSIC L25 SHAKEOUTS (Channel at 25%, dropped to 0%):")
         report_lines.append("-" * 100)
         report_lines.append(f"{'Ticker':<7} {'Price':<9} {'Range':<14} {'Low':<9} {'Entry':<9} {'Stop':<9} {'Target':<9} {'R:R':<6}")
         report_lines.append("-" * 100)
 
-        for setup in classic_setups[:20]:
-            report_lines.append(
-                f"{setup['ticker']:<7} "
-                f"${setup['current_price']:<8.2f} "
-                f"{setup['range']:<14} "
-                f"${setup['shakeout_low']:<8.2f} "
-                f"${setup['entry']:<8.2f} "
-                f"${setup['stop']:<8.2f} "
-                f"${setup['target']:<8.2f} "
-                f"{setup['rr_ratio']:<5.1f}x"
-            )
+        top_classic = classic_setups[:20]
+        report_lines.extend(format_rows(
+            "%-7s $%-8.2f %-14s $%-8.2f $%-8.2f $%-8.2f $%-8.2f %-5.1fx",
+            top_classic['ticker'],
+            top_classic['current_price'],
+            [range_label(setup) for setup in top_classic],
+            top_classic['shakeout_low'],
+            top_classic['entry'],
+            top_classic['stop'],
+            top_classic['target'],
+            top_classic['rr_ratio']
+        ))
 
         report_lines.append("")
 
@@ -320,16 +774,17 @@ def run_scanner():
     report_lines.append(f"{'Ticker':<7} {'Price':<9} {'Range':<14} {'Channel':<10} {'Shakeout':<10} {'Recovery':<10} {'Notes'}")
     report_lines.append("-" * 100)
 
-    for setup in all_setups[:40]:
-        report_lines.append(
-            f"{setup['ticker']:<7} "
-            f"${setup['current_price']:<8.2f} "
-            f"{setup['range']:<14} "
-            f"{setup['channel_level']:<10} "
-            f"${setup['shakeout_low']:<9.2f} "
-            f"{setup['recovery_pct']:<9.1f}% "
-            f"{setup['notes']}"
-        )
+    top_setups = all_setups[:40]
+    report_lines.extend(format_rows(
+        "%-7s $%-8.2f %-14s %-10s $%-9.2f %-9.1f%% %s",
+        top_setups['ticker'],
+        top_setups['current_price'],
+        [range_label(setup) for setup in top_setups],
+        [channel_label(level) for level in top_setups['channel_level']],
+        top_setups['shakeout_low'],
+        top_setups['recovery_pct'],
+        [format_notes(setup) for setup in top_setups]
+    ))
 
     report_lines.append("")
     report_lines.append("=" * 100)
@@ -344,20 +799,23 @@ def run_scanner():
 
     # Create TradingView list
     tv_file = os.path.join(buylist_dir, 'tradingview_channel_shakeout.txt')
+    tv_lines = [
+        "=" * 80,
+        "CHANNEL + RANGE SHAKEOUT SETUPS",
+        "=" * 80,
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Total: {len(all_setups)} setups",
+        "=" * 80,
+        ""
+    ]
+
+    if len(classic_setups):
+        tv_lines += ["CLASSIC L25 SHAKEOUTS (Best):", ",".join(classic_setups['ticker']), ""]
+
+    tv_lines += ["ALL SETUPS:", ",".join(all_setups['ticker']), ""]
+
     with open(tv_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("CHANNEL + RANGE SHAKEOUT SETUPS\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Total: {len(all_setups)} setups\n")
-        f.write("=" * 80 + "\n\n")
-
-        if classic_setups:
-            f.write("CLASSIC L25 SHAKEOUTS (Best):\n")
-            f.write(",".join([s['ticker'] for s in classic_setups]) + "\n\n")
-
-        f.write("ALL SETUPS:\n")
-        f.write(",".join([s['ticker'] for s in all_setups]) + "\n")
+        f.write("\n".join(tv_lines))
 
     print(report_text)
     print()
@@ -2,10 +2,262 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
+from _njit import njit, NUMBA_AVAILABLE
 
 # EFI - Faux VOL/VWAP Indicator
 # Converted from Pine Script v4
 
+# Categories of the fi_color column, in code order
+FI_COLORS = ['gray', 'lime', 'teal', 'maroon', 'orange']
+COLOR_GRAY, COLOR_LIME, COLOR_TEAL, COLOR_MAROON, COLOR_ORANGE = range(len(FI_COLORS))
+
+
+# Compiled versions of the pandas rolling/ewm primitives the indicator uses.
+# They follow pandas' own algorithms (NaN handling, Kahan-compensated sums,
+# Welford variance) so results match .ewm()/.rolling() to the last bit
+# (rolling variance to within rounding).
+
+@njit(cache=True)
+def _ewm_mean(values, alpha):
+    """Same as Series.ewm(alpha=alpha, adjust=False).mean()"""
+    n = len(values)
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    weighted = values[0]
+    out[0] = weighted
+    old_wt = 1.0
+
+    for i in range(1, n):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= 1.0 - alpha
+            if cur == cur:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+
+    return out
+
+
+@njit(cache=True)
+def _rolling_mean(values, window):
+    """Same as Series.rolling(window).mean()"""
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_count = 0
+    prev_value = np.nan
+
+    for i in range(n):
+        start = max(0, i + 1 - window)
+
+        if i == 0 or start >= i:
+            # First window (or window of 1) - start the sums over
+            nobs = 0
+            neg_ct = 0
+            sum_x = 0.0
+            comp_add = 0.0
+            comp_remove = 0.0
+            same_count = 0
+            prev_value = values[start]
+            first_new = start
+        else:
+            first_new = i
+            val = values[start - 1] if start > 0 else np.nan
+            if val == val:
+                nobs -= 1
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if np.signbit(val):
+                    neg_ct -= 1
+
+        for j in range(first_new, i + 1):
+            val = values[j]
+            if val == val:
+                nobs += 1
+                y = val - comp_add
+                t = sum_x + y
+                comp_add = t - sum_x - y
+                sum_x = t
+                if np.signbit(val):
+                    neg_ct += 1
+                same_count = same_count + 1 if val == prev_value else 1
+                prev_value = val
+
+        if nobs >= window and nobs > 0:
+            result = sum_x / nobs
+            if same_count >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(cache=True)
+def _atr(high, low, close, period):
+    """Same as the pandas calculate_atr: rolling mean of the true range"""
+    n = len(high)
+    tr = np.empty(n, dtype=high.dtype)
+
+    # True range in the input dtype, skipping NaN like DataFrame.max(axis=1)
+    for i in range(n):
+        best = high[i] - low[i]
+        if i > 0:
+            for candidate in (abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])):
+                if candidate > best or best != best:
+                    best = candidate
+        tr[i] = best
+
+    return _rolling_mean(tr, period)
+
+
+@njit(cache=True)
+def _rolling_var(values, window):
+    """Same as Series.rolling(window).var()"""
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    mean_x = 0.0
+    ssqdm_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_count = 0
+    prev_value = np.nan
+
+    for i in range(n):
+        start = max(0, i + 1 - window)
+
+        if i == 0 or start >= i:
+            nobs = 0
+            mean_x = 0.0
+            ssqdm_x = 0.0
+            comp_add = 0.0
+            comp_remove = 0.0
+            same_count = 0
+            prev_value = values[start]
+            first_new = start
+        else:
+            first_new = i
+            val = values[start - 1] if start > 0 else np.nan
+            if val == val:
+                nobs -= 1
+                if nobs:
+                    prev_mean = mean_x - comp_remove
+                    y = val - comp_remove
+                    t = y - mean_x
+                    comp_remove = t + mean_x - y
+                    mean_x -= t / nobs
+                    ssqdm_x -= (val - prev_mean) * (val - mean_x)
+                else:
+                    mean_x = 0.0
+                    ssqdm_x = 0.0
+
+        for j in range(first_new, i + 1):
+            val = values[j]
+            if val == val:
+                same_count = same_count + 1 if val == prev_value else 1
+                prev_value = val
+                nobs += 1
+                prev_mean = mean_x - comp_add
+                y = val - comp_add
+                t = y - mean_x
+                comp_add = t + mean_x - y
+                mean_x += t / nobs
+                ssqdm_x += (val - prev_mean) * (val - mean_x)
+
+        if nobs >= window and nobs > 1:
+            out[i] = 0.0 if same_count >= nobs else ssqdm_x / (nobs - 1)
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(cache=True)
+def _rolling_sum(values, window):
+    """Same as Series.rolling(window).sum()"""
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    sum_x = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_count = 0
+    prev_value = np.nan
+
+    for i in range(n):
+        start = max(0, i + 1 - window)
+
+        if i == 0 or start >= i:
+            nobs = 0
+            sum_x = 0.0
+            comp_add = 0.0
+            comp_remove = 0.0
+            same_count = 0
+            prev_value = values[start]
+            first_new = start
+        else:
+            first_new = i
+            val = values[start - 1] if start > 0 else np.nan
+            if val == val:
+                nobs -= 1
+                y = -val - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+
+        for j in range(first_new, i + 1):
+            val = values[j]
+            if val == val:
+                nobs += 1
+                y = val - comp_add
+                t = sum_x + y
+                comp_add = t - sum_x - y
+                sum_x = t
+                same_count = same_count + 1 if val == prev_value else 1
+                prev_value = val
+
+        if nobs >= window:
+            out[i] = prev_value * nobs if same_count >= nobs else sum_x
+        else:
+            out[i] = np.nan
+
+    return out
+
+
+@njit(cache=True)
+def _hp_stdev(mean, src, period):
+    """Same as the pandas calculate_stdev_high_precision"""
+    n = len(src)
+    sq = np.empty(n)
+    for i in range(n):
+        d = src[i] - mean[i]
+        sq[i] = d * d
+
+    out = _rolling_sum(sq, period)
+    for i in range(n):
+        out[i] = np.sqrt(out[i] / (period - 1))
+
+    return out
+
+
 class EFI_Indicator:
     """
     EFI - Faux VOL/VWAP (Elder Force Index with custom volume)
@@ -56,6 +308,9 @@ class EFI_Indicator:
 
     def calculate_atr(self, high, low, close, period):
         """Calculate Average True Range"""
+        if NUMBA_AVAILABLE:
+            return pd.Series(_atr(high.to_numpy(), low.to_numpy(), close.to_numpy(), period), index=high.index)
+
         tr1 = high - low
         tr2 = abs(high - close.shift())
         tr3 = abs(low - close.shift())
@@ -67,10 +322,15 @@ class EFI_Indicator:
 
     def calculate_ema(self, series, period):
         """Calculate Exponential Moving Average"""
+        if NUMBA_AVAILABLE:
+            alpha = 1.0 / (1.0 + (period - 1) / 2.0)  # pandas' alpha for span=period
+            return pd.Series(_ewm_mean(series.to_numpy(dtype=np.float64), alpha), index=series.index)
         return series.ewm(span=period, adjust=False).mean()
 
     def calculate_sma(self, series, period):
         """Calculate Simple Moving Average"""
+        if NUMBA_AVAILABLE:
+            return pd.Series(_rolling_mean(series.to_numpy(dtype=np.float64), period), index=series.index)
         return series.rolling(window=period).mean()
 
     def calculate_hma(self, series, period):
@@ -78,20 +338,26 @@ class EFI_Indicator:
         half_period = int(period / 2)
         sqrt_period = int(np.sqrt(period))
 
-        wma_half = series.rolling(window=half_period).mean()
-        wma_full = series.rolling(window=period).mean()
+        wma_half = self.calculate_sma(series, half_period)
+        wma_full = self.calculate_sma(series, period)
 
         raw_hma = 2 * wma_half - wma_full
-        hma = raw_hma.rolling(window=sqrt_period).mean()
+        hma = self.calculate_sma(raw_hma, sqrt_period)
 
         return hma
 
     def calculate_stdev(self, series, period):
         """Calculate standard deviation"""
+        if NUMBA_AVAILABLE:
+            variance = _rolling_var(series.to_numpy(dtype=np.float64), period)
+            return pd.Series(np.sqrt(np.maximum(variance, 0.0)), index=series.index)
         return series.rolling(window=period).std()
 
     def calculate_stdev_high_precision(self, mean, src, period):
         """Calculate high precision standard deviation"""
+        if NUMBA_AVAILABLE:
+            return pd.Series(_hp_stdev(mean.to_numpy(dtype=np.float64), src.to_numpy(dtype=np.float64), period),
+                             index=src.index)
         variance = ((src - mean) ** 2).rolling(window=period).sum() / (period - 1)
         return np.sqrt(variance)
 
@@ -103,25 +369,21 @@ class EFI_Indicator:
             basis: Middle band (EMA or HMA)
             dev: Standard deviation
         """
-        # Scale factor for precision (especially for crypto)
-        sf = src.iloc[0] if len(src) > 0 else 1.0
-        src2 = src / sf
+        # Pine's version divides src by its first value and scales back
+        # afterwards; the mean and stdev are scale-equivariant and float
+        # precision is relative, so they work on src directly
 
         # Calculate mean
         if self.useemaforboll:
-            mean = self.calculate_ema(src2, self.bollperiod)
+            basis = self.calculate_ema(src, self.bollperiod)
         else:
-            mean = self.calculate_hma(src2, self.bollperiod)
+            basis = self.calculate_hma(src, self.bollperiod)
 
         # Calculate standard deviation
         if self.usemystdev:
-            dev = self.calculate_stdev_high_precision(mean, src2, self.bollperiod)
+            dev = self.calculate_stdev_high_precision(basis, src, self.bollperiod)
         else:
-            dev = self.calculate_stdev(src2, self.bollperiod)
-
-        # Scale back
-        basis = mean * sf
-        dev = dev * sf
+            dev = self.calculate_stdev(src, self.bollperiod)
 
         return basis, dev
 
@@ -170,94 +432,181 @@ class EFI_Indicator:
         basis, dev = self.calculate_bollinger_bands(close)
 
         # Calculate histogram (basis - signal)
-        hist = basis - self.calculate_ema(basis, self.signalperiod)
+        hist = basis.to_numpy() - self.calculate_ema(basis, self.signalperiod).to_numpy()
 
         # Calculate faux volume-weighted price
         vw = self.calculate_faux_volume(df)
 
-        # Calculate Force Index
-        price_change = close - close.shift(1)
-        vw_sma = self.calculate_sma(vw, self.fi_asf_len)
+        # The rest works on plain arrays, so no index alignment per operation
+        close_arr = close.to_numpy()
+        basis_arr = basis.to_numpy()
+        dev_arr = dev.to_numpy()
+        vw_arr = vw.to_numpy()
 
-        forceindex = (price_change * vw / vw_sma) * self.fisf
+        # Calculate Force Index
+        price_change = np.empty_like(close_arr)
+        price_change[0:1] = np.nan
+        price_change[1:] = close_arr[1:] - close_arr[:-1]
+        if self.fi_asf_len == 1:
+            # The SMA of length 1 is vw itself, so vw cancels; only keep the
+            # NaN the division gives where vw is 0, NaN or inf (e.g. zero ATR)
+            forceindex = price_change.astype(np.float64) * self.fisf
+            forceindex[~np.isfinite(vw_arr) | (vw_arr == 0)] = np.nan
+        else:
+            vw_sma = self.calculate_sma(vw, self.fi_asf_len).to_numpy()
+            forceindex = (price_change * vw_arr / vw_sma) * self.fisf
 
         # Force Index EMA
-        fi_ema = self.calculate_ema(forceindex, self.fiperiod)
+        fi = self.calculate_ema(pd.Series(forceindex, index=df.index), self.fiperiod).to_numpy()
 
         # Normalized Price
-        normprice = close - basis
+        normprice = close_arr - basis_arr
 
-        # Bollinger Band levels
-        upper_band = 0 + dev * self.mult
-        lower_band = 0 - dev * self.mult
-        upper_band_inner = 0 + dev * self.multlow
-        lower_band_inner = 0 - dev * self.multlow
+        # Bollinger Band levels (0 - band rather than -band keeps a zero-width
+        # band at +0.0)
+        upper_band = dev_arr * self.mult
+        lower_band = 0 - upper_band
+        upper_band_inner = dev_arr * self.multlow
+        lower_band_inner = 0 - upper_band_inner
 
         # Determine Force Index color based on direction and momentum
-        fi_change = fi_ema.diff()
-        fi_color = pd.Series(index=df.index, dtype=str)
-
-        for i in range(len(fi_ema)):
-            if pd.isna(fi_ema.iloc[i]):
-                fi_color.iloc[i] = 'gray'
-            elif fi_ema.iloc[i] > 0:
-                if not pd.isna(fi_change.iloc[i]) and fi_change.iloc[i] > 0:
-                    fi_color.iloc[i] = 'lime'  # Strong bullish
-                else:
-                    fi_color.iloc[i] = 'teal'  # Weak bullish
-            else:
-                if not pd.isna(fi_change.iloc[i]) and fi_change.iloc[i] < 0:
-                    fi_color.iloc[i] = 'maroon'  # Strong bearish
-                else:
-                    fi_color.iloc[i] = 'orange'  # Weak bearish
-
-        # Create results DataFrame
+        fi_change = np.empty_like(fi)
+        fi_change[0:1] = np.nan
+        fi_change[1:] = fi[1:] - fi[:-1]
+
+        # Stored as int8 codes into FI_COLORS so later compares are integer compares
+        # (a NaN change fails both momentum tests, giving teal / orange)
+        fi_color_codes = np.select(
+            [
+                np.isnan(fi),                   # gray
+                (fi > 0) & (fi_change > 0),     # lime - Strong bullish
+                fi > 0,                         # teal - Weak bullish
+                fi_change < 0                   # maroon - Strong bearish
+            ],
+            [COLOR_GRAY, COLOR_LIME, COLOR_TEAL, COLOR_MAROON],
+            default=COLOR_ORANGE                # orange - Weak bearish
+        ).astype(np.int8)
+
+        fi_color = pd.Categorical.from_codes(fi_color_codes, categories=FI_COLORS)
+
+        # Create results DataFrame once from the finished arrays
         results = pd.DataFrame({
-            'basis': basis,
-            'dev': dev,
+            'basis': basis_arr,
+            'dev': dev_arr,
             'upper_band': upper_band,
             'lower_band': lower_band,
             'upper_band_inner': upper_band_inner,
             'lower_band_inner': lower_band_inner,
-            'force_index': fi_ema,
+            'force_index': fi,
             'normalized_price': normprice,
             'histogram': hist,
             'fi_color': fi_color,
-            'vw': vw
-        }, index=df.index)
+            'vw': vw_arr
+        }, index=df.index, copy=False)
 
         return results
 
-    def get_signals(self, df):
+    def calculate_tail(self, df, tail=None):
+        """
+        Calculate indicator values for only the most recent bars
+
+        The rolling windows only look back a fixed number of bars, but the
+        EMAs carry weight from the whole history. The default tail is long
+        enough for the weight left on the dropped bars, (1 - alpha) ** n, to
+        fall below float64 precision, so the latest values match
+        calculate(df) to within rounding.
+
+        Args:
+            df: DataFrame with OHLCV data
+            tail: Number of trailing bars to calculate on (default: enough
+                for the EMAs to converge)
+
+        Returns:
+            DataFrame with indicator values for the last tail bars
+        """
+        if tail is None:
+            ema_periods = [self.fiperiod, self.signalperiod]
+            if self.useemaforboll:
+                ema_periods.append(self.bollperiod)
+            alpha = 2.0 / (max(ema_periods) + 1.0)
+            warmup = int(np.ceil(np.log(np.finfo(np.float64).eps) / np.log1p(-alpha)))
+
+            # Plus the windows feeding the EMAs and the stdev of the basis
+            tail = warmup + self.bollperiod + self.atr_period + self.fi_asf_len + 1
+
+        if len(df) <= tail:
+            return self.calculate(df)
+
+        return self.calculate(df.iloc[-tail:])
+
+    def get_signals(self, df, results=None):
         """
         Generate trading signals based on the indicator
 
+        Args:
+            df: DataFrame with OHLCV data
+            results: Optional output of calculate(df), to reuse instead of
+                recalculating the indicator
+
         Returns:
             DataFrame with signal information
         """
-        results = self.calculate(df)
+        if results is None:
+            results = self.calculate(df)
 
-        signals = pd.DataFrame(index=df.index)
+        fi = results['force_index'].to_numpy()
+        normprice = results['normalized_price'].to_numpy()
+
+        # Previous bar's force index vs zero (the first bar has no previous
+        # bar, which like a NaN fails both tests)
+        prev_le_zero = np.zeros(len(fi), dtype=bool)
+        prev_ge_zero = np.zeros(len(fi), dtype=bool)
+        prev_le_zero[1:] = fi[:-1] <= 0
+        prev_ge_zero[1:] = fi[:-1] >= 0
 
         # Force Index crosses zero
-        signals['fi_cross_above_zero'] = (results['force_index'] > 0) & (results['force_index'].shift(1) <= 0)
-        signals['fi_cross_below_zero'] = (results['force_index'] < 0) & (results['force_index'].shift(1) >= 0)
+        fi_cross_above_zero = (fi > 0) & prev_le_zero
+        fi_cross_below_zero = (fi < 0) & prev_ge_zero
+
+        # Force index momentum (compared on the int8 colour codes)
+        fi_color_codes = results['fi_color'].cat.codes.to_numpy()
+
+        signals = pd.DataFrame({
+            'fi_cross_above_zero': fi_cross_above_zero,
+            'fi_cross_below_zero': fi_cross_below_zero,
+            # Normalized price crosses bands
+            'price_above_upper': normprice > results['upper_band'].to_numpy(),
+            'price_below_lower': normprice < results['lower_band'].to_numpy(),
+            'fi_strong_bullish': fi_color_codes == COLOR_LIME,
+            'fi_weak_bullish': fi_color_codes == COLOR_TEAL,
+            'fi_strong_bearish': fi_color_codes == COLOR_MAROON,
+            'fi_weak_bearish': fi_color_codes == COLOR_ORANGE,
+            # Combined signals
+            'buy_signal': fi_cross_above_zero & (normprice > 0),
+            'sell_signal': fi_cross_below_zero & (normprice < 0)
+        }, index=df.index, copy=False)
 
-        # Normalized price crosses bands
-        signals['price_above_upper'] = results['normalized_price'] > results['upper_band']
-        signals['price_below_lower'] = results['normalized_price'] < results['lower_band']
+        return signals, results
 
-        # Force index momentum
-        signals['fi_strong_bullish'] = results['fi_color'] == 'lime'
-        signals['fi_weak_bullish'] = results['fi_color'] == 'teal'
-        signals['fi_strong_bearish'] = results['fi_color'] == 'maroon'
-        signals['fi_weak_bearish'] = results['fi_color'] == 'orange'
 
-        # Combined signals
-        signals['buy_signal'] = signals['fi_cross_above_zero'] & (results['normalized_price'] > 0)
-        signals['sell_signal'] = signals['fi_cross_below_zero'] & (results['normalized_price'] < 0)
+def compile_kernels(dtype=np.float32):
+    """
+    Compile the EFI kernels before starting a process pool
 
-        return signals, results
+    Runs the default indicator once on a tiny frame of the given price
+    dtype, so the kernels are compiled (or loaded from numba's on-disk
+    cache) once in the parent process. Forked workers inherit them ready
+    to run, and spawned workers find the cache already written instead of
+    all compiling it at the same time.
+
+    Args:
+        dtype: dtype of the High/Low/Close columns the workers will pass in
+    """
+    if not NUMBA_AVAILABLE:
+        return
+
+    prices = pd.DataFrame({column: np.ones(4, dtype=dtype) for column in ['High', 'Low', 'Close']})
+    EFI_Indicator().calculate(prices)
 
 
 def scan_with_efi(ticker_symbol, results_dir, indicator_params=None):
@@ -302,8 +651,10 @@ def scan_with_efi(ticker_symbol, results_dir, indicator_params=None):
         else:
             indicator = EFI_Indicator(**indicator_params)
 
-        # Get signals
-        signals, results = indicator.get_signals(df)
+        # Get signals (only the last few bars are checked, so only the tail
+        # of the history is calculated)
+        results = indicator.calculate_tail(df)
+        signals, results = indicator.get_signals(df.iloc[-len(results):], results)
 
         # Check most recent signals
         latest_idx = -1
@@ -316,9 +667,10 @@ def scan_with_efi(ticker_symbol, results_dir, indicator_params=None):
 
         if recent_buy or recent_sell:
             signal_type = 'BUY' if recent_buy else 'SELL'
-            fi_value = results['force_index'].iloc[latest_idx]
-            norm_price = results['normalized_price'].iloc[latest_idx]
-            fi_color = results['fi_color'].iloc[latest_idx]
+            latest = results.iloc[latest_idx]  # One row lookup for all values
+            fi_value = latest['force_index']
+            norm_price = latest['normalized_price']
+            fi_color = latest['fi_color']
 
             return {
                 'ticker': ticker_symbol,
@@ -328,8 +680,8 @@ def scan_with_efi(ticker_symbol, results_dir, indicator_params=None):
                 'force_index': fi_value,
                 'normalized_price': norm_price,
                 'fi_color': fi_color,
-                'upper_band': results['upper_band'].iloc[latest_idx],
-                'lower_band': results['lower_band'].iloc[latest_idx]
+                'upper_band': latest['upper_band'],
+                'lower_band': latest['lower_band']
             }
 
         return None
@@ -1,9 +1,13 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from EFI_Indicator import EFI_Indicator
+from functools import partial
+from EFI_Indicator import EFI_Indicator, compile_kernels
 from PriceRangeZones import calculate_price_range_zones, determine_trend
+from _cache import cache_dir, cache_key, cached_frame, read_cached_frame, source_version, write_cached_frame
+from _prices import read_price_csv
 
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,18 +17,111 @@ results_dir = os.path.join(script_dir, 'updated_Results_for_scan')
 buylist_dir = os.path.join(script_dir, 'buylist')
 output_file = os.path.join(buylist_dir, 'efi_pricezone_scan_results.txt')
 tradingview_file = os.path.join(buylist_dir, 'tradingview_efi_pricezone_list.txt')
+price_cache_dir = cache_dir('pricezone_prices')
+indicator_cache_dir = cache_dir('pricezone_indicators')
+
+# The indicators and zones only read these, so they're the only columns kept
+PRICE_DTYPES = {'High': np.float32, 'Low': np.float32, 'Close': np.float32}
+
+# One report table row: ticker, date, price, range, position %, zone target, force index
+SIGNAL_ROW_FORMAT = "%-8s %-12s $%-9.2f %-15s %-7.1f%% $%-9.2f %11.2f"
+
+# One shared indicator with the default settings; each worker process gets
+# its own copy when it imports this module
+_DEFAULT_INDICATOR = EFI_Indicator()
 
 def get_ticker_list(results_dir):
     """Get ticker symbols from CSV files in the results directory"""
     try:
-        csv_files = [f for f in os.listdir(results_dir) if f.endswith('.csv')]
-        tickers = [f[:-4] for f in csv_files]
-        return sorted(tickers)
+        with os.scandir(results_dir) as entries:
+            return sorted(entry.name[:-4] for entry in entries if entry.name.endswith('.csv') and entry.is_file())
     except Exception as e:
         print(f"Error reading results directory: {e}")
         return []
 
-def scan_ticker_combined(ticker_symbol, results_dir):
+def load_price_data(ticker_symbol, csv_file):
+    """
+    Load a ticker's prices, caching the parsed CSV as Parquet
+
+    The cache lives in price_cache_dir (when pyarrow is installed) and is
+    rebuilt whenever the ticker's CSV or the CSV reader changes.
+
+    Args:
+        ticker_symbol: Stock ticker
+        csv_file: Path to the ticker's CSV file
+
+    Returns:
+        DataFrame with float32 High/Low/Close columns indexed by UTC date
+    """
+    cache_file = os.path.join(price_cache_dir, f"{ticker_symbol}.parquet")
+    key = cache_key(csv_file, source_version(read_price_csv), PRICE_DTYPES)
+
+    return cached_frame(cache_file, key, lambda: read_price_csv(csv_file, PRICE_DTYPES))
+
+def calculate_latest_indicators(ticker_symbol, csv_file, indicator=_DEFAULT_INDICATOR):
+    """
+    Calculate the EFI / price zone / trend values of a ticker's latest bar
+
+    The zone and trend values are only calculated when the bar is maroon,
+    since neither signal can fire otherwise. Results are cached per ticker
+    as Parquet in indicator_cache_dir (when pyarrow is installed) and reused
+    until the ticker's CSV, the indicator's settings or the indicator code
+    change, so repeat scans skip reading the prices at all.
+
+    Args:
+        ticker_symbol: Stock ticker
+        csv_file: Path to the ticker's CSV file
+        indicator: EFI_Indicator to calculate with (default settings if omitted)
+
+    Returns:
+        Dict of latest-bar values, or None if the ticker has fewer than 100 bars
+    """
+    cache_file = os.path.join(indicator_cache_dir, f"{ticker_symbol}.parquet")
+    key = cache_key(csv_file, source_version(__file__, EFI_Indicator, calculate_price_range_zones), vars(indicator))
+
+    cached = read_cached_frame(cache_file, key)
+    if cached is not None:
+        return cached.iloc[0].to_dict()
+
+    df = load_price_data(ticker_symbol, csv_file)
+
+    if len(df) < 100:
+        return None
+
+    # Calculate EFI indicator (only the latest bar is used)
+    efi_latest = indicator.calculate_tail(df).iloc[-1]
+
+    latest = {
+        'date': df.index[-1],
+        'price': df['Close'].iloc[-1],
+        'fi_color': efi_latest['fi_color'],
+        'normalized_price': efi_latest['normalized_price'],
+        'force_index': efi_latest['force_index']
+    }
+
+    if latest['fi_color'] == 'maroon':
+        # The zones (100 bar high/low) and trend (50 bar SMA) of the latest
+        # bar only depend on the last 100 bars, so skip the rest of the history
+        df_tail = df.iloc[-100:]
+
+        zones_latest = calculate_price_range_zones(df_tail, lookback_period=100).iloc[-1]
+        trend = determine_trend(df_tail, lookback_period=50)
+
+        latest.update({
+            'price_zone': zones_latest['price_zone'],
+            'trend': trend.iloc[-1],
+            'range_position_pct': zones_latest['range_position_pct'],
+            'zone_25_pct': zones_latest['zone_25_pct'],
+            'zone_75_pct': zones_latest['zone_75_pct'],
+            'range_floor': zones_latest['range_floor'],
+            'range_ceiling': zones_latest['range_ceiling']
+        })
+
+    write_cached_frame(cache_file, key, pd.DataFrame([latest]))
+
+    return latest
+
+def scan_ticker_combined(ticker_symbol, results_dir, indicator=_DEFAULT_INDICATOR):
     """
     Scan a single ticker for combined EFI + Price Zone signals
 
@@ -41,6 +138,7 @@ def scan_ticker_combined(ticker_symbol, results_dir):
     Args:
         ticker_symbol: Stock ticker
         results_dir: Directory containing CSV files
+        indicator: EFI_Indicator to calculate with (default settings if omitted)
 
     Returns:
         Dict with signal information or None
@@ -51,48 +149,28 @@ def scan_ticker_combined(ticker_symbol, results_dir):
         if not os.path.exists(csv_file):
             return None
 
-        # Read CSV
-        with open(csv_file, 'r') as f:
-            first_line = f.readline().strip()
-
-        has_header = 'Ticker' in first_line or 'Date' in first_line or 'Open' in first_line
-
-        if has_header:
-            df = pd.read_csv(csv_file, header=0, index_col=0)
-        else:
-            df = pd.read_csv(csv_file, header=None, index_col=0)
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        latest = calculate_latest_indicators(ticker_symbol, csv_file, indicator)
 
-        df.index = pd.to_datetime(df.index, errors='coerce', utc=True)
-        df = df[df.index.notna()]
-
-        if len(df) < 100:
+        if latest is None:
             return None
 
-        # Calculate EFI indicator
-        indicator = EFI_Indicator()
-        efi_results = indicator.calculate(df)
-
-        # Calculate price range zones
-        zones = calculate_price_range_zones(df, lookback_period=100)
+        fi_color = latest['fi_color']
 
-        # Determine trend
-        trend = determine_trend(df, lookback_period=50)
+        # Both signals need a maroon bar
+        if fi_color != 'maroon':
+            return None
 
-        # Get most recent values
-        latest_idx = -1
-        fi_color = efi_results['fi_color'].iloc[latest_idx]
-        normalized_price = efi_results['normalized_price'].iloc[latest_idx]
-        force_index = efi_results['force_index'].iloc[latest_idx]
+        normalized_price = latest['normalized_price']
+        force_index = latest['force_index']
 
-        current_price = df['Close'].iloc[latest_idx]
-        price_zone = zones['price_zone'].iloc[latest_idx]
-        current_trend = trend.iloc[latest_idx]
-        range_position = zones['range_position_pct'].iloc[latest_idx]
-        zone_25 = zones['zone_25_pct'].iloc[latest_idx]
-        zone_75 = zones['zone_75_pct'].iloc[latest_idx]
-        range_floor = zones['range_floor'].iloc[latest_idx]
-        range_ceiling = zones['range_ceiling'].iloc[latest_idx]
+        current_price = latest['price']
+        price_zone = latest['price_zone']
+        current_trend = latest['trend']
+        range_position = latest['range_position_pct']
+        zone_25 = latest['zone_25_pct']
+        zone_75 = latest['zone_75_pct']
+        range_floor = latest['range_floor']
+        range_ceiling = latest['range_ceiling']
 
         # Check for BUY signal: Maroon + Buy Zone + Uptrend
         buy_condition_1 = fi_color == 'maroon'
@@ -112,12 +190,13 @@ def scan_ticker_combined(ticker_symbol, results_dir):
             signal_type = 'SELL'
 
         if signal_type:
-            current_date = df.index[latest_idx]
+            current_date = latest['date']
 
             return {
                 'ticker': ticker_symbol,
                 'signal': signal_type,
                 'date': current_date,
+                'date_str': current_date.strftime('%m/%d/%Y'),
                 'price': current_price,
                 'trend': current_trend,
                 'fi_color': fi_color,
@@ -137,6 +216,30 @@ def scan_ticker_combined(ticker_symbol, results_dir):
         print(f"Error scanning {ticker_symbol}: {e}")
         return None
 
+def format_signal_rows(signals, zone_key):
+    """
+    Format the report table rows for a list of signals
+
+    Args:
+        signals: Signal dicts from scan_ticker_combined
+        zone_key: Zone target column to show ('zone_25_pct' or 'zone_75_pct')
+
+    Returns:
+        List of formatted lines
+    """
+    return [
+        SIGNAL_ROW_FORMAT % (
+            signal['ticker'],
+            signal['date_str'],
+            signal['price'],
+            f"${signal['range_floor']:.0f}-${signal['range_ceiling']:.0f}",
+            signal['range_position_pct'],
+            signal[zone_key],
+            signal['force_index']
+        )
+        for signal in signals
+    ]
+
 def run_combined_scan():
     """Main scanning function"""
     print("=" * 80)
@@ -168,17 +271,18 @@ def run_combined_scan():
     print(f"Scanning {len(tickers)} tickers...")
     print()
 
-    # Scan all tickers
+    # Scan all tickers - each ticker is independent, so fan out across CPU cores
     signals = []
+    scan = partial(scan_ticker_combined, results_dir=results_dir)
+    compile_kernels(PRICE_DTYPES['Close'])
 
-    for i, ticker in enumerate(tickers):
-        if (i + 1) % 100 == 0:
-            print(f"Progress: {i + 1}/{len(tickers)} tickers scanned...")
-
-        result = scan_ticker_combined(ticker, results_dir)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for i, result in enumerate(executor.map(scan, tickers, chunksize=16)):
+            if (i + 1) % 100 == 0:
+                print(f"Progress: {i + 1}/{len(tickers)} tickers scanned...")
 
-        if result:
-            signals.append(result)
+            if result:
+                signals.append(result)
 
     print()
     print(f"Scan complete!")
@@ -223,18 +327,7 @@ def run_combined_scan():
         report_lines.append(f"{'Ticker':<8} {'Date':<12} {'Price':<10} {'Range':<15} {'Pos %':<8} {'25% Zone':<10} {'Force Idx':<12}")
         report_lines.append("-" * 80)
 
-        for signal in buy_signals:
-            date_str = signal['date'].strftime('%m/%d/%Y')
-            range_str = f"${signal['range_floor']:.0f}-${signal['range_ceiling']:.0f}"
-            report_lines.append(
-                f"{signal['ticker']:<8} "
-                f"{date_str:<12} "
-                f"${signal['price']:<9.2f} "
-                f"{range_str:<15} "
-                f"{signal['range_position_pct']:<7.1f}% "
-                f"${signal['zone_25_pct']:<9.2f} "
-                f"{signal['force_index']:>11.2f}"
-            )
+        report_lines.extend(format_signal_rows(buy_signals, 'zone_25_pct'))
 
         report_lines.append("")
         report_lines.append("=" * 80)
@@ -247,18 +340,7 @@ def run_combined_scan():
         report_lines.append(f"{'Ticker':<8} {'Date':<12} {'Price':<10} {'Range':<15} {'Pos %':<8} {'75% Zone':<10} {'Force Idx':<12}")
         report_lines.append("-" * 80)
 
-        for signal in sell_signals:
-            date_str = signal['date'].strftime('%m/%d/%Y')
-            range_str = f"${signal['range_floor']:.0f}-${signal['range_ceiling']:.0f}"
-            report_lines.append(
-                f"{signal['ticker']:<8} "
-                f"{date_str:<12} "
-                f"${signal['price']:<9.2f} "
-                f"{range_str:<15} "
-                f"{signal['range_position_pct']:<7.1f}% "
-                f"${signal['zone_75_pct']:<9.2f} "
-                f"{signal['force_index']:>11.2f}"
-            )
+        report_lines.extend(format_signal_rows(sell_signals, 'zone_75_pct'))
 
         report_lines.append("")
         report_lines.append("=" * 80)
@@ -10,6 +10,54 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 # Output file path
 output_file = os.path.join(script_dir, 'CSV', 'ASX_stocks.csv')
 
+# Common ASX ETFs, always added to the list as (ticker, company)
+ASX_ETFS = (
+    ('VAS', 'Vanguard Australian Shares Index ETF'),
+    ('VGS', 'Vanguard MSCI Index International Shares ETF'),
+    ('VTS', 'Vanguard US Total Market Shares Index ETF'),
+    ('A200', 'BetaShares Australia 200 ETF'),
+    ('IOZ', 'iShares Core S&P/ASX 200 ETF'),
+    ('STW', 'SPDR S&P/ASX 200 Fund'),
+    ('VHY', 'Vanguard Australian Shares High Yield ETF'),
+    ('VDHG', 'Vanguard Diversified High Growth Index ETF'),
+    ('DHHF', 'BetaShares Diversified All Growth ETF'),
+    ('NDQ', 'BetaShares NASDAQ 100 ETF'),
+    ('IVV', 'iShares S&P 500 ETF'),
+    ('VGE', 'Vanguard FTSE Emerging Markets Shares ETF'),
+    ('VAP', 'Vanguard Australian Property Securities Index ETF'),
+    ('VAF', 'Vanguard Australian Fixed Interest Index ETF'),
+    ('VGB', 'Vanguard Australian Government Bond Index ETF'),
+    ('GOLD', 'ETFS Physical Gold'),
+    ('QAU', 'BetaShares Gold Bullion ETF - Currency Hedged'),
+    ('BBOZ', 'BetaShares Australian Equities Strong Bear'),
+    ('BEAR', 'BetaShares Australian Equities Bear'),
+    ('YMAX', 'BetaShares S&P 500 Yield Maximiser Fund'),
+)
+
+# Top ASX stocks, added when Wikipedia returns too few tickers
+TOP_ASX_STOCKS = (
+    ('BHP', 'BHP Group Limited'),
+    ('CBA', 'Commonwealth Bank of Australia'),
+    ('CSL', 'CSL Limited'),
+    ('NAB', 'National Australia Bank Limited'),
+    ('WBC', 'Westpac Banking Corporation'),
+    ('ANZ', 'Australia and New Zealand Banking Group'),
+    ('WES', 'Wesfarmers Limited'),
+    ('MQG', 'Macquarie Group Limited'),
+    ('WOW', 'Woolworths Group Limited'),
+    ('GMG', 'Goodman Group'),
+    ('RIO', 'Rio Tinto Limited'),
+    ('FMG', 'Fortescue Metals Group Ltd'),
+    ('TLS', 'Telstra Corporation Limited'),
+    ('WDS', 'Woodside Energy Group Ltd'),
+    ('TCL', 'Transurban Group'),
+    ('REA', 'REA Group Ltd'),
+    ('COL', 'Coles Group Limited'),
+    ('QBE', 'QBE Insurance Group Limited'),
+    ('STO', 'Santos Limited'),
+    ('S32', 'South32 Limited'),
+)
+
 def get_asx_stocks():
     """
     Fetch ASX stock list from Wikipedia and other sources
@@ -87,59 +135,14 @@ def get_asx_stocks():
 
     # Add common ASX ETFs manually
     print("\nAdding common ASX ETFs...")
-    asx_etfs = [
-        {'Ticker': 'VAS', 'Company': 'Vanguard Australian Shares Index ETF'},
-        {'Ticker': 'VGS', 'Company': 'Vanguard MSCI Index International Shares ETF'},
-        {'Ticker': 'VTS', 'Company': 'Vanguard US Total Market Shares Index ETF'},
-        {'Ticker': 'A200', 'Company': 'BetaShares Australia 200 ETF'},
-        {'Ticker': 'IOZ', 'Company': 'iShares Core S&P/ASX 200 ETF'},
-        {'Ticker': 'STW', 'Company': 'SPDR S&P/ASX 200 Fund'},
-        {'Ticker': 'VHY', 'Company': 'Vanguard Australian Shares High Yield ETF'},
-        {'Ticker': 'VDHG', 'Company': 'Vanguard Diversified High Growth Index ETF'},
-        {'Ticker': 'DHHF', 'Company': 'BetaShares Diversified All Growth ETF'},
-        {'Ticker': 'NDQ', 'Company': 'BetaShares NASDAQ 100 ETF'},
-        {'Ticker': 'IVV', 'Company': 'iShares S&P 500 ETF'},
-        {'Ticker': 'VGE', 'Company': 'Vanguard FTSE Emerging Markets Shares ETF'},
-        {'Ticker': 'VAP', 'Company': 'Vanguard Australian Property Securities Index ETF'},
-        {'Ticker': 'VAF', 'Company': 'Vanguard Australian Fixed Interest Index ETF'},
-        {'Ticker': 'VGB', 'Company': 'Vanguard Australian Government Bond Index ETF'},
-        {'Ticker': 'GOLD', 'Company': 'ETFS Physical Gold'},
-        {'Ticker': 'QAU', 'Company': 'BetaShares Gold Bullion ETF - Currency Hedged'},
-        {'Ticker': 'BBOZ', 'Company': 'BetaShares Australian Equities Strong Bear'},
-        {'Ticker': 'BEAR', 'Company': 'BetaShares Australian Equities Bear'},
-        {'Ticker': 'YMAX', 'Company': 'BetaShares S&P 500 Yield Maximiser Fund'},
-    ]
-
-    etf_df = pd.DataFrame(asx_etfs)
+    etf_df = pd.DataFrame(ASX_ETFS, columns=['Ticker', 'Company'])
     all_stocks = pd.concat([all_stocks, etf_df], ignore_index=True)
     all_stocks = all_stocks.drop_duplicates(subset=['Ticker'])
 
     # Add top ASX stocks manually if we didn't get many from Wikipedia
     if len(all_stocks) < 50:
         print("\nAdding top ASX stocks manually...")
-        top_asx_stocks = [
-            {'Ticker': 'BHP', 'Company': 'BHP Group Limited'},
-            {'Ticker': 'CBA', 'Company': 'Commonwealth Bank of Australia'},
-            {'Ticker': 'CSL', 'Company': 'CSL Limited'},
-            {'Ticker': 'NAB', 'Company': 'National Australia Bank Limited'},
-            {'Ticker': 'WBC', 'Company': 'Westpac Banking Corporation'},
-            {'Ticker': 'ANZ', 'Company': 'Australia and New Zealand Banking Group'},
-            {'Ticker': 'WES', 'Company': 'Wesfarmers Limited'},
-            {'Ticker': 'MQG', 'Company': 'Macquarie Group Limited'},
-            {'Ticker': 'WOW', 'Company': 'Woolworths Group Limited'},
-            {'Ticker': 'GMG', 'Company': 'Goodman Group'},
-            {'Ticker': 'RIO', 'Company': 'Rio Tinto Limited'},
-            {'Ticker': 'FMG', 'Company': 'Fortescue Metals Group Ltd'},
-            {'Ticker': 'TLS', 'Company': 'Telstra Corporation Limited'},
-            {'Ticker': 'WDS', 'Company': 'Woodside Energy Group Ltd'},
-            {'Ticker': 'TCL', 'Company': 'Transurban Group'},
-            {'Ticker': 'REA', 'Company': 'REA Group Ltd'},
-            {'Ticker': 'COL', 'Company': 'Coles Group Limited'},
-            {'Ticker': 'QBE', 'Company': 'QBE Insurance Group Limited'},
-            {'Ticker': 'STO', 'Company': 'Santos Limited'},
-            {'Ticker': 'S32', 'Company': 'South32 Limited'},
-        ]
-        top_df = pd.DataFrame(top_asx_stocks)
+        top_df = pd.DataFrame(TOP_ASX_STOCKS, columns=['Ticker', 'Company'])
         all_stocks = pd.concat([all_stocks, top_df], ignore_index=True)
         all_stocks = all_stocks.drop_duplicates(subset=['Ticker'])
 
@@ -1,7 +1,11 @@
 import pandas as pd
+import numpy as np
 import os
 import talib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from _cache import cache_dir, cache_key, cached_frame, source_version
+from _prices import read_price_columns
 
 # Directory path
 input_directory = r'watchlist_Scanner\updated_Results_for_scan'
@@ -10,6 +14,9 @@ input_directory = r'watchlist_Scanner\updated_Results_for_scan'
 output_file_name = "scan_results_text"
 output_file_path = os.path.join(input_directory, output_file_name) # Full path to the output file
 
+# Parsed price CSVs are cached here as Parquet (when pyarrow is installed)
+price_cache_dir = cache_dir('jimmy_channel_prices')
+
 # EMA and ATR parameters
 ema1_per = 5
 ema2_per = 26
@@ -25,12 +32,70 @@ one_week_ago = datetime.now() - timedelta(days=7)
 # Get 1 day ago
 two_days_ago = datetime.now() - timedelta(days=2)
 
-def write_to_file(text):
+def write_to_file(lines):
     with open(output_file_path, 'a') as file: # a stands for append mode
-        file.write(text + '\n')
+        file.write(''.join(line + '\n' for line in lines))
+
+def to_wall_clock(index):
+    """
+    Get a naive DatetimeIndex holding each date's local (wall-clock) time
+
+    read_csv leaves the index as strings when the UTC offsets change
+    (daylight saving), and tz-aware when there is a single offset, so
+    both are brought down to the naive time written in the file.
+
+    Args:
+        index: Index as loaded by read_csv/read_parquet
+
+    Returns:
+        Naive DatetimeIndex
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        return index.tz_localize(None) if index.tz is not None else index
+
+    # Drop the trailing UTC offset and parse what's left
+    local_times = pd.Index(index, dtype=str).str.replace(r'(?:Z|[+-]\d{2}:\d{2})$', '', regex=True)
+    return pd.DatetimeIndex(pd.to_datetime(local_times, format='ISO8601'))
+
+def load_price_data(file_name, file_path):
+    """
+    Read a file from the input directory, caching parsed CSVs as Parquet
+
+    The cache lives in price_cache_dir (when pyarrow is installed) and is
+    rebuilt whenever the CSV or the CSV reader changes. Files that aren't
+    CSVs are read directly every time.
+
+    Args:
+        file_name: Name of the file in input_directory
+        file_path: Path to the file
+
+    Returns:
+        DataFrame indexed by the file's dates, as naive wall-clock times
+    """
+    if not file_name.endswith('.csv'):
+        data = read_price_columns(file_path)
+    else:
+        cache_file = os.path.join(price_cache_dir, f"{file_name[:-4]}.parquet")
+        key = cache_key(file_path, source_version(read_price_columns))
+        data = cached_frame(cache_file, key, lambda: read_price_columns(file_path))
+
+    data.index = to_wall_clock(data.index)
+    return data
+
+def scan_one(file_name):
+    """
+    Scan one file in the input directory for squeeze channel breakouts
+
+    Args:
+        file_name: Name of the file in input_directory
+
+    Returns:
+        (buy_lines, sell_lines) - BUY lines for the output file and SELL
+        lines for the console
+    """
+    buy_lines = []
+    sell_lines = []
 
-# Iterate over the files in the input directory
-for file_name in os.listdir(input_directory):
     try:
         # Input file path for current file
         file_path = os.path.join(input_directory, file_name)
@@ -38,23 +103,34 @@ for file_name in os.listdir(input_directory):
         
 
         # Read the existing CSV file
-        data = pd.read_csv(file_path, index_col=0, parse_dates=True)
+        data = load_price_data(file_name, file_path)
 
         # Calculate EMAs and ATR
-        ema1 = talib.EMA(data['Close'], timeperiod=ema1_per)
-        ema2 = talib.EMA(data['Close'], timeperiod=ema2_per)
-        atr = talib.ATR(data['High'], data['Low'], data['Close'], timeperiod=atr_per) * atr_mult
-
-        # Calculate Squeeze Channel Levels
-        SqLup = (ema2 + atr).where((ema2 - ema1).abs() < atr, float('nan'))
-        SqLdn = (ema2 - atr).where((ema2 - ema1).abs() < atr, float('nan'))
+        ema1 = talib.EMA(data['Close'], timeperiod=ema1_per).to_numpy()
+        ema2 = talib.EMA(data['Close'], timeperiod=ema2_per).to_numpy()
+        atr = talib.ATR(data['High'], data['Low'], data['Close'], timeperiod=atr_per).to_numpy() * atr_mult
+
+        # Calculate Squeeze Channel Levels (NaN on bars without a squeeze)
+        in_squeeze = np.abs(ema2 - ema1) < atr
+        SqLup = np.where(in_squeeze, ema2 + atr, np.nan)
+        SqLdn = np.where(in_squeeze, ema2 - atr, np.nan)
+
+        # Find channel breakouts on every bar at once: the level existed on the
+        # previous bar, is gone on this one, and the close is beyond it
+        # (an upside breakout takes precedence over a downside one)
+        close = data['Close'].to_numpy()
+
+        up_break = np.zeros(len(data), dtype=bool)
+        dn_break = np.zeros(len(data), dtype=bool)
+        up_break[1:] = ~np.isnan(SqLup[:-1]) & np.isnan(SqLup[1:]) & (close[1:] >= SqLup[:-1])
+        dn_break[1:] = ~np.isnan(SqLdn[:-1]) & np.isnan(SqLdn[1:]) & (close[1:] <= SqLdn[:-1]) & ~up_break[1:]
+        up_break[:3] = False
+        dn_break[:3] = False
 
         # Check for channel breakouts over last month
-        
-        for i in range(3, len(data)):
-            date_of_event = pd.Timestamp(data.index[i]).tz_localize(None) if pd.Timestamp(data.index[i]).tzinfo else pd.Timestamp(data.index[i])
-            if date_of_event < one_month_ago:
-                continue
+        recent = data.index >= one_month_ago
+        for i in np.flatnonzero((up_break | dn_break) & recent):
+            date_of_event = data.index[i]
 
         # Check for channel breakouts over last week
         # for i in range(3, len(data)):
@@ -62,12 +138,12 @@ for file_name in os.listdir(input_directory):
         #     if date_of_event < one_week_ago:
         #         continue
 
-            if not pd.isna(SqLup.iloc[i-1]) and pd.isna(SqLup.iloc[i]) and data['Close'].iloc[i] >= SqLup.iloc[i-1]:
+            if up_break[i]:
                 # print(f"{ticker_symbol} channel forming")
-                write_to_file(f"BUY {ticker_symbol} {date_of_event.strftime('%m/%d/%Y')} : Upside Breakout {data['Close'].iloc[1].round(3)} " )
-            elif not pd.isna(SqLdn.iloc[i-1]) and pd.isna(SqLdn.iloc[i]) and data['Close'].iloc[i] <= SqLdn.iloc[i-1]:
+                buy_lines.append(f"BUY {ticker_symbol} {date_of_event.strftime('%m/%d/%Y')} : Upside Breakout {data['Close'].iloc[1].round(3)} " )
+            else:
                 # print(f"{ticker_symbol} channel forming")
-                print(f"SELL {ticker_symbol} {date_of_event.strftime('%m/%d/%Y')} : Downside Breakdown  {data['Close'].iloc[1].round(3)}")
+                sell_lines.append(f"SELL {ticker_symbol} {date_of_event.strftime('%m/%d/%Y')} : Downside Breakdown  {data['Close'].iloc[1].round(3)}")
         # use print for console and use write to file for file
 
 
@@ -75,6 +151,20 @@ for file_name in os.listdir(input_directory):
         print(f"Exception encountered for {ticker_symbol}: {str(e)}")
         print(f"Exception type: {type(e)}")
 
-write_to_file("n\Scan process completed")
+    return buy_lines, sell_lines
+
+if __name__ == "__main__":
+    # Collect the output file's lines and write them in one go at the end
+    output_lines = []
+
+    # Each file is independent, so fan out across CPU cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for buy_lines, sell_lines in executor.map(scan_one, os.listdir(input_directory), chunksize=16):
+            output_lines.extend(buy_lines)
+            for line in sell_lines:
+                print(line)
+
+    output_lines.append("n\Scan process completed")
+    write_to_file(output_lines)
 
-print("\nScan process completed.")
\ No newline at end of file
+    print("\nScan process completed.")
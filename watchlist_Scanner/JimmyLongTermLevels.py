@@ -2,6 +2,14 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime
+from _prices import PRICE_COLUMNS, read_price_csv
+
+# Optional: polars reads every ticker into one frame and aggregates them together
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
 
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,6 +19,9 @@ results_dir = os.path.join(script_dir, 'updated_Results_for_scan')
 buylist_dir = os.path.join(script_dir, 'buylist')
 output_file = os.path.join(buylist_dir, 'jimmy_long_term_levels.txt')
 
+# The levels only read these (Volume is never used), so they're the only columns kept
+PRICE_DTYPES = {'Open': np.float32, 'High': np.float32, 'Low': np.float32, 'Close': np.float32}
+
 def get_ticker_list(results_dir):
     """Get ticker symbols from CSV files in the results directory"""
     try:
@@ -21,7 +32,35 @@ def get_ticker_list(results_dir):
         print(f"Error reading results directory: {e}")
         return []
 
-def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_quarterly=True):
+def find_near_levels(levels, tolerance=0.02):
+    """
+    Get the names of the levels the current price is near (within tolerance)
+
+    Args:
+        levels: Level data as from calculate_jimmy_levels
+        tolerance: Maximum distance from a level as a fraction of it (default 2%)
+
+    Returns:
+        List of level names, e.g. ['Quarterly High']
+    """
+    current_price = levels['current_price']
+
+    def is_near_level(price, level):
+        """Check if price is within tolerance% of level"""
+        return abs(price - level) / level <= tolerance
+
+    near_levels = []
+
+    for period, name in [('monthly', 'Monthly'), ('quarterly', 'Quarterly')]:
+        period_levels = levels[period]
+        if period_levels:
+            for key in ['high', 'low', 'open', 'close']:
+                if is_near_level(current_price, period_levels[key]):
+                    near_levels.append(f"{name} {key.title()}")
+
+    return near_levels
+
+def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_quarterly=True, known_tickers=None):
     """
     Calculate Jimmy's Long Term Levels (Monthly and Quarterly support/resistance)
 
@@ -34,6 +73,8 @@ def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_
         results_dir: Directory containing CSV files
         show_monthly: Show monthly levels (default False)
         show_quarterly: Show quarterly levels (default True)
+        known_tickers: Set of tickers with a CSV in results_dir (from
+            get_ticker_list), checked instead of the file system if given
 
     Returns:
         Dictionary with level data or None
@@ -41,23 +82,14 @@ def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_
     try:
         csv_file = os.path.join(results_dir, f"{ticker_symbol}.csv")
 
-        if not os.path.exists(csv_file):
+        if known_tickers is not None:
+            if ticker_symbol not in known_tickers:
+                return None
+        elif not os.path.exists(csv_file):
             return None
 
         # Read CSV
-        with open(csv_file, 'r') as f:
-            first_line = f.readline().strip()
-
-        has_header = 'Ticker' in first_line or 'Date' in first_line or 'Open' in first_line
-
-        if has_header:
-            df = pd.read_csv(csv_file, header=0, index_col=0)
-        else:
-            df = pd.read_csv(csv_file, header=None, index_col=0)
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-
-        df.index = pd.to_datetime(df.index, errors='coerce', utc=True)
-        df = df[df.index.notna()]
+        df = read_price_csv(csv_file, PRICE_DTYPES)
 
         # Need at least 6 months of data
         if len(df) < 126:  # ~6 months of trading days
@@ -72,8 +104,7 @@ def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_
             'Open': 'first',
             'High': 'max',
             'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
+            'Close': 'last'
         }).dropna()
 
         # Resample to quarterly data (3 months)
@@ -81,8 +112,7 @@ def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_
             'Open': 'first',
             'High': 'max',
             'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
+            'Close': 'last'
         }).dropna()
 
         levels = {
@@ -120,34 +150,7 @@ def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_
             }
 
         # Check if current price is near any levels (within 2%)
-        def is_near_level(price, level, tolerance=0.02):
-            """Check if price is within tolerance% of level"""
-            return abs(price - level) / level <= tolerance
-
-        # Analyze which levels price is near
-        levels['near_levels'] = []
-
-        if levels['monthly']:
-            m = levels['monthly']
-            if is_near_level(current_price, m['high']):
-                levels['near_levels'].append('Monthly High')
-            if is_near_level(current_price, m['low']):
-                levels['near_levels'].append('Monthly Low')
-            if is_near_level(current_price, m['open']):
-                levels['near_levels'].append('Monthly Open')
-            if is_near_level(current_price, m['close']):
-                levels['near_levels'].append('Monthly Close')
-
-        if levels['quarterly']:
-            q = levels['quarterly']
-            if is_near_level(current_price, q['high']):
-                levels['near_levels'].append('Quarterly High')
-            if is_near_level(current_price, q['low']):
-                levels['near_levels'].append('Quarterly Low')
-            if is_near_level(current_price, q['open']):
-                levels['near_levels'].append('Quarterly Open')
-            if is_near_level(current_price, q['close']):
-                levels['near_levels'].append('Quarterly Close')
+        levels['near_levels'] = find_near_levels(levels)
 
         return levels
 
@@ -155,6 +158,145 @@ def calculate_jimmy_levels(ticker_symbol, results_dir, show_monthly=False, show_
         print(f"Error calculating levels for {ticker_symbol}: {e}")
         return None
 
+def read_price_csv_polars(csv_file):
+    """
+    Read a ticker's CSV (with or without a header row) as a polars frame
+
+    Raises a polars error when a value can't be converted or a column is
+    missing, so the caller can fall back to the pandas path.
+
+    Returns:
+        polars DataFrame with a UTC Date column and Float32 Open/High/Low/Close,
+        rows with unparseable dates dropped
+    """
+    lf = pl.scan_csv(csv_file, infer_schema=False)
+
+    first_line = ','.join(lf.collect_schema().names())
+    has_header = 'Ticker' in first_line or 'Date' in first_line or 'Open' in first_line
+
+    if not has_header:
+        lf = pl.scan_csv(csv_file, has_header=False, new_columns=PRICE_COLUMNS, infer_schema=False)
+
+    date_col = lf.collect_schema().names()[0]
+
+    return (
+        lf.select(
+            pl.col(date_col).str.to_datetime(time_zone='UTC', strict=False).alias('Date'),
+            *[pl.col(col).cast(pl.Float64).fill_nan(None).cast(pl.Float32) for col in PRICE_DTYPES]
+        )
+        .drop_nulls('Date')
+        .collect()
+    )
+
+def previous_period_levels(prices, every):
+    """
+    Get each ticker's previous complete period OHLC from a combined price frame
+
+    Args:
+        prices: polars DataFrame of every ticker's bars (with a ticker column)
+        every: Period length ('1mo' or '1q')
+
+    Returns:
+        Dict of ticker -> level dict (tickers with fewer than 2 periods left out)
+    """
+    periods = (
+        prices.sort('ticker', 'Date')
+        .group_by_dynamic('Date', every=every, group_by='ticker')
+        .agg(
+            pl.col('Open').drop_nulls().first(),
+            pl.col('High').max(),
+            pl.col('Low').min(),
+            pl.col('Close').drop_nulls().last()
+        )
+        .drop_nulls(['Open', 'High', 'Low', 'Close'])
+    )
+
+    # Index -2 because -1 is the current incomplete period
+    previous = (
+        periods.filter(pl.len().over('ticker') >= 2)
+        .group_by('ticker')
+        .agg(pl.all().slice(-2, 1).first())
+    )
+
+    # Label each period by its last day, as pandas' ME/QE resample does
+    period_end = previous['Date'].dt.offset_by('2mo' if every == '1q' else '0mo').dt.month_end().to_list()
+    columns = {col: previous[col].to_numpy() for col in ['Open', 'High', 'Low', 'Close']}
+
+    return {
+        ticker: {
+            'date': pd.Timestamp(period_end[i]),
+            'high': columns['High'][i],
+            'low': columns['Low'][i],
+            'open': columns['Open'][i],
+            'close': columns['Close'][i]
+        }
+        for i, ticker in enumerate(previous['ticker'].to_list())
+    }
+
+def calculate_all_levels(tickers, results_dir, show_monthly=False, show_quarterly=True):
+    """
+    Calculate Jimmy's Long Term Levels for many tickers at once with polars
+
+    Every readable CSV goes into one frame with a ticker column, so the
+    monthly/quarterly OHLC of all tickers comes from one grouped
+    aggregation instead of a pandas resample per ticker.
+
+    Args:
+        tickers: Ticker symbols with a CSV in results_dir
+        results_dir: Directory containing CSV files
+        show_monthly: Show monthly levels (default False)
+        show_quarterly: Show quarterly levels (default True)
+
+    Returns:
+        Dict of ticker -> level data (None if too little data), as from
+        calculate_jimmy_levels. Tickers whose CSV polars couldn't read are
+        left out for calculate_jimmy_levels to handle.
+    """
+    frames = []
+    for ticker in tickers:
+        try:
+            prices = read_price_csv_polars(os.path.join(results_dir, f"{ticker}.csv"))
+        except pl.exceptions.PolarsError:
+            continue  # Messy file - let the pandas path read it
+        frames.append(prices.select(pl.lit(ticker).alias('ticker'), pl.all()))
+
+    if not frames:
+        return {}
+
+    prices = pl.concat(frames)
+
+    # Bar count and current price (last bar in file order) per ticker
+    latest = prices.group_by('ticker', maintain_order=True).agg(
+        pl.len().alias('bars'),
+        pl.col('Date').last(),
+        pl.col('Close').last().fill_null(float('nan'))
+    )
+
+    monthly = previous_period_levels(prices, '1mo') if show_monthly else {}
+    quarterly = previous_period_levels(prices, '1q') if show_quarterly else {}
+
+    current_prices = latest['Close'].to_numpy()
+    current_dates = latest['Date'].to_list()
+
+    all_levels = {}
+    for i, (ticker, bars) in enumerate(zip(latest['ticker'].to_list(), latest['bars'].to_list())):
+        # Need at least 6 months of data
+        if bars < 126:  # ~6 months of trading days
+            all_levels[ticker] = None
+            continue
+
+        levels = {
+            'ticker': ticker,
+            'current_date': pd.Timestamp(current_dates[i]),
+            'current_price': current_prices[i],
+            'monthly': monthly.get(ticker),
+            'quarterly': quarterly.get(ticker)
+        }
+        levels['near_levels'] = find_near_levels(levels)
+        all_levels[ticker] = levels
+
+    return all_levels
+
 def run_jimmy_levels_scan(show_monthly=False, show_quarterly=True):
     """
     Run Jimmy's Long Term Levels scan across all tickers
@@ -180,6 +322,7 @@ def run_jimmy_levels_scan(show_monthly=False, show_quarterly=True):
 
     # Get ticker list
     tickers = get_ticker_list(results_dir)
+    known_tickers = set(tickers)
     print(f"Scanning {len(tickers)} tickers...")
     print()
 
@@ -187,11 +330,17 @@ def run_jimmy_levels_scan(show_monthly=False, show_quarterly=True):
     all_levels = []
     stocks_near_levels = []
 
+    # Aggregate every ticker polars can read in one go; the rest use the pandas path
+    batch_levels = calculate_all_levels(tickers, results_dir, show_monthly, show_quarterly) if POLARS_AVAILABLE else {}
+
     for i, ticker in enumerate(tickers):
         if (i + 1) % 100 == 0:
             print(f"Progress: {i + 1}/{len(tickers)} tickers scanned...")
 
-        result = calculate_jimmy_levels(ticker, results_dir, show_monthly, show_quarterly)
+        if ticker in batch_levels:
+            result = batch_levels[ticker]
+        else:
+            result = calculate_jimmy_levels(ticker, results_dir, show_monthly, show_quarterly, known_tickers)
 
         if result:
             all_levels.append(result)
@@ -204,108 +353,110 @@ def run_jimmy_levels_scan(show_monthly=False, show_quarterly=True):
     print(f"Found {len(stocks_near_levels)} stocks near key levels")
     print()
 
-    # Generate report
-    report_lines = []
-    report_lines.append("=" * 80)
-    report_lines.append("JIMMY'S LONG TERM LEVELS - SUPPORT/RESISTANCE SCANNER")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Scan Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append("")
-    report_lines.append("CONCEPT:")
-    report_lines.append("  Previous month and quarter OHLC levels often act as strong")
-    report_lines.append("  support and resistance zones. Stocks near these levels may")
-    report_lines.append("  bounce (at support) or reverse (at resistance).")
-    report_lines.append("")
-    report_lines.append(f"Total Stocks Analyzed: {len(all_levels)}")
-    report_lines.append(f"Stocks Near Key Levels (within 2%): {len(stocks_near_levels)}")
-    report_lines.append("")
-    report_lines.append("=" * 80)
-    report_lines.append("")
-
-    if stocks_near_levels:
-        # Sort by number of levels nearby (most levels first)
-        stocks_near_levels.sort(key=lambda x: len(x['near_levels']), reverse=True)
-
-        report_lines.append("STOCKS NEAR KEY SUPPORT/RESISTANCE LEVELS:")
-        report_lines.append("-" * 80)
-        report_lines.append(f"{'Ticker':<8} {'Price':<10} {'Levels Nearby':<50}")
-        report_lines.append("-" * 80)
-
-        for stock in stocks_near_levels:
-            levels_str = ", ".join(stock['near_levels'])
-            report_lines.append(
-                f"{stock['ticker']:<8} "
-                f"${stock['current_price']:<9.2f} "
-                f"{levels_str}"
-            )
-
-        report_lines.append("")
-        report_lines.append("=" * 80)
-        report_lines.append("")
-
-    # Detailed levels for top 50 stocks by market cap (or all if less than 50)
-    report_lines.append("DETAILED LEVELS - ALL STOCKS:")
-    report_lines.append("-" * 80)
-
-    if show_monthly and show_quarterly:
-        report_lines.append(f"{'Ticker':<8} {'Price':<10} {'M-High':<10} {'M-Low':<10} {'Q-High':<10} {'Q-Low':<10}")
-        report_lines.append("-" * 80)
-
-        for stock in all_levels[:100]:  # Show first 100
-            m = stock['monthly'] if stock['monthly'] else {'high': 0, 'low': 0}
-            q = stock['quarterly'] if stock['quarterly'] else {'high': 0, 'low': 0}
-
-            report_lines.append(
-                f"{stock['ticker']:<8} "
-                f"${stock['current_price']:<9.2f} "
-                f"${m['high']:<9.2f} "
-                f"${m['low']:<9.2f} "
-                f"${q['high']:<9.2f} "
-                f"${q['low']:<9.2f}"
-            )
-
-    elif show_quarterly:
-        report_lines.append(f"{'Ticker':<8} {'Price':<10} {'Q-High':<10} {'Q-Low':<10} {'Q-Open':<10} {'Q-Close':<10}")
-        report_lines.append("-" * 80)
-
-        for stock in all_levels[:100]:
-            q = stock['quarterly']
-            if q:
-                report_lines.append(
+    # Generate report, streaming each line to the file and the console
+    with open(output_file, 'w') as f:
+        separator = ''
+
+        def add_line(line):
+            """Write one report line to the report file and the console"""
+            nonlocal separator
+            f.write(separator + line)
+            separator = '\n'
+            print(line)
+
+        add_line("=" * 80)
+        add_line("JIMMY'S LONG TERM LEVELS - SUPPORT/RESISTANCE SCANNER")
+        add_line("=" * 80)
+        add_line(f"Scan Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        add_line("")
+        add_line("CONCEPT:")
+        add_line("  Previous month and quarter OHLC levels often act as strong")
+        add_line("  support and resistance zones. Stocks near these levels may")
+        add_line("  bounce (at support) or reverse (at resistance).")
+        add_line("")
+        add_line(f"Total Stocks Analyzed: {len(all_levels)}")
+        add_line(f"Stocks Near Key Levels (within 2%): {len(stocks_near_levels)}")
+        add_line("")
+        add_line("=" * 80)
+        add_line("")
+
+        if stocks_near_levels:
+            # Sort by number of levels nearby (most levels first)
+            stocks_near_levels.sort(key=lambda x: len(x['near_levels']), reverse=True)
+
+            add_line("STOCKS NEAR KEY SUPPORT/RESISTANCE LEVELS:")
+            add_line("-" * 80)
+            add_line(f"{'Ticker':<8} {'Price':<10} {'Levels Nearby':<50}")
+            add_line("-" * 80)
+
+            for stock in stocks_near_levels:
+                levels_str = ", ".join(stock['near_levels'])
+                add_line(
                     f"{stock['ticker']:<8} "
                     f"${stock['current_price']:<9.2f} "
+                    f"{levels_str}"
+                )
+
+            add_line("")
+            add_line("=" * 80)
+            add_line("")
+
+        # Detailed levels for top 50 stocks by market cap (or all if less than 50)
+        add_line("DETAILED LEVELS - ALL STOCKS:")
+        add_line("-" * 80)
+
+        if show_monthly and show_quarterly:
+            add_line(f"{'Ticker':<8} {'Price':<10} {'M-High':<10} {'M-Low':<10} {'Q-High':<10} {'Q-Low':<10}")
+            add_line("-" * 80)
+
+            for stock in all_levels[:100]:  # Show first 100
+                m = stock['monthly'] if stock['monthly'] else {'high': 0, 'low': 0}
+                q = stock['quarterly'] if stock['quarterly'] else {'high': 0, 'low': 0}
+
+                add_line(
+                    f"{stock['ticker']:<8} "
+                    f"${stock['current_price']:<9.2f} "
+                    f"${m['high']:<9.2f} "
+                    f"${m['low']:<9.2f} "
                     f"${q['high']:<9.2f} "
-                    f"${q['low']:<9.2f} "
-                    f"${q['open']:<9.2f} "
-                    f"${q['close']:<9.2f}"
+                    f"${q['low']:<9.2f}"
                 )
 
-    report_lines.append("")
-    report_lines.append("=" * 80)
-    report_lines.append("")
-    report_lines.append("LEGEND:")
-    report_lines.append("  M-High/M-Low: Previous Month High/Low")
-    report_lines.append("  Q-High/Q-Low: Previous Quarter High/Low")
-    report_lines.append("  Q-Open/Q-Close: Previous Quarter Open/Close")
-    report_lines.append("")
-    report_lines.append("TRADING STRATEGY:")
-    report_lines.append("  - Watch for bounces at Low levels (support)")
-    report_lines.append("  - Watch for rejections at High levels (resistance)")
-    report_lines.append("  - Breakouts above resistance can signal strong moves")
-    report_lines.append("  - Breakdowns below support can signal weakness")
-    report_lines.append("  - Open/Close levels often act as pivot points")
-    report_lines.append("")
-
-    # Write to file
-    report_text = '\n'.join(report_lines)
-    with open(output_file, 'w') as f:
-        f.write(report_text)
+        elif show_quarterly:
+            add_line(f"{'Ticker':<8} {'Price':<10} {'Q-High':<10} {'Q-Low':<10} {'Q-Open':<10} {'Q-Close':<10}")
+            add_line("-" * 80)
+
+            for stock in all_levels[:100]:
+                q = stock['quarterly']
+                if q:
+                    add_line(
+                        f"{stock['ticker']:<8} "
+                        f"${stock['current_price']:<9.2f} "
+                        f"${q['high']:<9.2f} "
+                        f"${q['low']:<9.2f} "
+                        f"${q['open']:<9.2f} "
+                        f"${q['close']:<9.2f}"
+                    )
+
+        add_line("")
+        add_line("=" * 80)
+        add_line("")
+        add_line("LEGEND:")
+        add_line("  M-High/M-Low: Previous Month High/Low")
+        add_line("  Q-High/Q-Low: Previous Quarter High/Low")
+        add_line("  Q-Open/Q-Close: Previous Quarter Open/Close")
+        add_line("")
+        add_line("TRADING STRATEGY:")
+        add_line("  - Watch for bounces at Low levels (support)")
+        add_line("  - Watch for rejections at High levels (resistance)")
+        add_line("  - Breakouts above resistance can signal strong moves")
+        add_line("  - Breakdowns below support can signal weakness")
+        add_line("  - Open/Close levels often act as pivot points")
+        add_line("")
 
     # Create TradingView list for stocks near levels
     create_tradingview_list(stocks_near_levels)
 
-    # Print to console
-    print(report_text)
     print(f"Report saved to: {output_file}")
 
 def create_tradingview_list(stocks_near_levels):
@@ -1,7 +1,11 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+from _cache import cache_dir, cache_key, cached_frame, source_version
+from _prices import read_price_csv
 
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,6 +14,16 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 results_dir = os.path.join(script_dir, 'updated_Results_for_scan')
 buylist_dir = os.path.join(script_dir, 'buylist')
 output_file = os.path.join(buylist_dir, 'monthly_quarterly_crossover_results.txt')
+confirmed_breakdowns_file = os.path.join(buylist_dir, 'tradingview_confirmed_breakdowns.txt')
+severe_weakness_file = os.path.join(buylist_dir, 'tradingview_severe_weakness.txt')
+price_cache_dir = cache_dir('crossover_prices')
+
+# Report separator lines
+SEP = "=" * 80
+THIN_SEP = "-" * 80
+
+# The crossovers only read these (Volume is never used), so they're the only columns kept
+PRICE_DTYPES = {'Open': np.float32, 'High': np.float32, 'Low': np.float32, 'Close': np.float32}
 
 def get_ticker_list(results_dir):
     """Get ticker symbols from CSV files in the results directory"""
@@ -21,145 +35,216 @@ def get_ticker_list(results_dir):
         print(f"Error reading results directory: {e}")
         return []
 
-def detect_monthly_quarterly_crossover(ticker_symbol, results_dir):
+def load_price_data(ticker_symbol, csv_file):
     """
-    Detect if previous month crossed below previous quarter levels
+    Load a ticker's prices, caching the parsed CSV as Parquet
 
-    Specifically looking for:
-    - Previous Month Low < Previous Quarter Low (breakdown)
-    - Previous Month Low < Previous Quarter Open (weakness)
-    - Previous Month Close < Previous Quarter Low (confirmed breakdown)
-    - Previous Month Close < Previous Quarter Open (confirmed weakness)
+    The cache lives in price_cache_dir (when pyarrow is installed) and is
+    rebuilt whenever the ticker's CSV or the CSV reader changes.
+
+    Args:
+        ticker_symbol: Stock ticker
+        csv_file: Path to the ticker's CSV file
+
+    Returns:
+        DataFrame with float32 Open/High/Low/Close columns indexed by UTC date
+    """
+    cache_file = os.path.join(price_cache_dir, f"{ticker_symbol}.parquet")
+    key = cache_key(csv_file, source_version(read_price_csv), PRICE_DTYPES)
+
+    return cached_frame(cache_file, key, lambda: read_price_csv(csv_file, PRICE_DTYPES, iso8601_first=True))
+
+def load_ticker_prices(ticker_symbol, results_dir):
+    """
+    Load a ticker's prices for the crossover checks
 
     Args:
         ticker_symbol: Stock ticker
         results_dir: Directory containing CSV files
 
     Returns:
-        Dictionary with crossover data or None
+        DataFrame as from load_price_data, or None if the CSV is missing or
+        holds less than 6 months of data
     """
-    try:
-        csv_file = os.path.join(results_dir, f"{ticker_symbol}.csv")
+    csv_file = os.path.join(results_dir, f"{ticker_symbol}.csv")
+
+    if not os.path.exists(csv_file):
+        return None
 
-        if not os.path.exists(csv_file):
-            return None
+    df = load_price_data(ticker_symbol, csv_file)
 
-        # Read CSV
-        with open(csv_file, 'r') as f:
-            first_line = f.readline().strip()
+    # Need at least 6 months of data
+    if len(df) < 126:  # ~6 months of trading days
+        return None
 
-        has_header = 'Ticker' in first_line or 'Date' in first_line or 'Open' in first_line
+    return df
 
-        if has_header:
-            df = pd.read_csv(csv_file, header=0, index_col=0)
-        else:
-            df = pd.read_csv(csv_file, header=None, index_col=0)
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-
-        df.index = pd.to_datetime(df.index, errors='coerce', utc=True)
-        df = df[df.index.notna()]
-
-        # Need at least 6 months of data
-        if len(df) < 126:  # ~6 months of trading days
-            return None
-
-        # Get current price
-        current_price = df['Close'].iloc[-1]
-        current_date = df.index[-1]
-
-        # Resample to monthly data
-        monthly_df = df.resample('ME').agg({
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
-        }).dropna()
-
-        # Resample to quarterly data (3 months)
-        quarterly_df = df.resample('QE').agg({
-            'Open': 'first',
-            'High': 'max',
-            'Low': 'min',
-            'Close': 'last',
-            'Volume': 'sum'
-        }).dropna()
-
-        # Need at least 2 complete months and 2 complete quarters
-        if len(monthly_df) < 2 or len(quarterly_df) < 2:
-            return None
-
-        # Get PREVIOUS month's OHLC (index -2 because -1 is current incomplete month)
-        prev_month = monthly_df.iloc[-2]
-        prev_month_date = monthly_df.index[-2]
-
-        # Get PREVIOUS quarter's OHLC (index -2 because -1 is current incomplete quarter)
-        prev_quarter = quarterly_df.iloc[-2]
-        prev_quarter_date = quarterly_df.index[-2]
-
-        # Check for crossover conditions
-        crossovers = []
-
-        # 1. Previous Month Low crossed below Previous Quarter Low
-        if prev_month['Low'] < prev_quarter['Low']:
-            crossovers.append('Month Low < Quarter Low')
-
-        # 2. Previous Month Low crossed below Previous Quarter Open
-        if prev_month['Low'] < prev_quarter['Open']:
-            crossovers.append('Month Low < Quarter Open')
-
-        # 3. Previous Month Close crossed below Previous Quarter Low
-        if prev_month['Close'] < prev_quarter['Low']:
-            crossovers.append('Month Close < Quarter Low')
-
-        # 4. Previous Month Close crossed below Previous Quarter Open
-        if prev_month['Close'] < prev_quarter['Open']:
-            crossovers.append('Month Close < Quarter Open')
-
-        # If no crossovers detected, return None
-        if not crossovers:
-            return None
-
-        # Calculate severity metrics
-        month_low_vs_quarter_low_pct = ((prev_month['Low'] - prev_quarter['Low']) / prev_quarter['Low']) * 100
-        month_close_vs_quarter_low_pct = ((prev_month['Close'] - prev_quarter['Low']) / prev_quarter['Low']) * 100
-        month_close_vs_quarter_open_pct = ((prev_month['Close'] - prev_quarter['Open']) / prev_quarter['Open']) * 100
-
-        # Calculate current price vs quarter low (how much recovery/further decline)
-        current_vs_quarter_low_pct = ((current_price - prev_quarter['Low']) / prev_quarter['Low']) * 100
-
-        return {
-            'ticker': ticker_symbol,
-            'current_date': current_date,
-            'current_price': current_price,
-            'prev_month_date': prev_month_date,
-            'prev_month_open': prev_month['Open'],
-            'prev_month_high': prev_month['High'],
-            'prev_month_low': prev_month['Low'],
-            'prev_month_close': prev_month['Close'],
-            'prev_quarter_date': prev_quarter_date,
-            'prev_quarter_open': prev_quarter['Open'],
-            'prev_quarter_high': prev_quarter['High'],
-            'prev_quarter_low': prev_quarter['Low'],
-            'prev_quarter_close': prev_quarter['Close'],
-            'crossovers': crossovers,
-            'month_low_vs_quarter_low_pct': month_low_vs_quarter_low_pct,
-            'month_close_vs_quarter_low_pct': month_close_vs_quarter_low_pct,
-            'month_close_vs_quarter_open_pct': month_close_vs_quarter_open_pct,
-            'current_vs_quarter_low_pct': current_vs_quarter_low_pct
-        }
+def period_end(month):
+    """Get the UTC timestamp of the last day of a month number (months since 1970-01)"""
+    return pd.Timestamp(np.datetime64(int(month) + 1, 'M').astype('datetime64[D]') - 1, tz='UTC')
 
+def crossover_result(ticker_symbol, current_date, current_price,
+                     prev_month_date, prev_month, prev_quarter_date, prev_quarter):
+    """
+    Check a ticker's previous month against its previous quarter
+
+    Args:
+        ticker_symbol: Stock ticker
+        current_date: Date of the latest bar
+        current_price: Close of the latest bar
+        prev_month_date, prev_quarter_date: Period end dates
+        prev_month, prev_quarter: {'Open', 'High', 'Low', 'Close'} dicts
+
+    Returns:
+        Dictionary with crossover data or None if nothing crossed
+    """
+    # Check for crossover conditions
+    crossovers = []
+
+    # 1. Previous Month Low crossed below Previous Quarter Low
+    if prev_month['Low'] < prev_quarter['Low']:
+        crossovers.append('Month Low < Quarter Low')
+
+    # 2. Previous Month Low crossed below Previous Quarter Open
+    if prev_month['Low'] < prev_quarter['Open']:
+        crossovers.append('Month Low < Quarter Open')
+
+    # 3. Previous Month Close crossed below Previous Quarter Low
+    if prev_month['Close'] < prev_quarter['Low']:
+        crossovers.append('Month Close < Quarter Low')
+
+    # 4. Previous Month Close crossed below Previous Quarter Open
+    if prev_month['Close'] < prev_quarter['Open']:
+        crossovers.append('Month Close < Quarter Open')
+
+    # If no crossovers detected, return None
+    if not crossovers:
+        return None
+
+    # Calculate severity metrics
+    month_low_vs_quarter_low_pct = ((prev_month['Low'] - prev_quarter['Low']) / prev_quarter['Low']) * 100
+    month_close_vs_quarter_low_pct = ((prev_month['Close'] - prev_quarter['Low']) / prev_quarter['Low']) * 100
+    month_close_vs_quarter_open_pct = ((prev_month['Close'] - prev_quarter['Open']) / prev_quarter['Open']) * 100
+
+    # Calculate current price vs quarter low (how much recovery/further decline)
+    current_vs_quarter_low_pct = ((current_price - prev_quarter['Low']) / prev_quarter['Low']) * 100
+
+    return {
+        'ticker': ticker_symbol,
+        'current_date': current_date,
+        'current_price': current_price,
+        'prev_month_date': prev_month_date,
+        'prev_month_open': prev_month['Open'],
+        'prev_month_high': prev_month['High'],
+        'prev_month_low': prev_month['Low'],
+        'prev_month_close': prev_month['Close'],
+        'prev_quarter_date': prev_quarter_date,
+        'prev_quarter_open': prev_quarter['Open'],
+        'prev_quarter_high': prev_quarter['High'],
+        'prev_quarter_low': prev_quarter['Low'],
+        'prev_quarter_close': prev_quarter['Close'],
+        'crossovers': crossovers,
+        'month_low_vs_quarter_low_pct': month_low_vs_quarter_low_pct,
+        'month_close_vs_quarter_low_pct': month_close_vs_quarter_low_pct,
+        'month_close_vs_quarter_open_pct': month_close_vs_quarter_open_pct,
+        'current_vs_quarter_low_pct': current_vs_quarter_low_pct
+    }
+
+def load_ticker_prices_safe(ticker_symbol, results_dir):
+    """Load a ticker's prices as from load_ticker_prices, printing any error and returning None"""
+    try:
+        return load_ticker_prices(ticker_symbol, results_dir)
     except Exception as e:
         print(f"Error calculating crossovers for {ticker_symbol}: {e}")
         return None
 
+def previous_periods(prices, periods):
+    """
+    Get every ticker's second-to-last complete period OHLC from a combined price frame
+
+    Args:
+        prices: DataFrame of every ticker's bars (ticker column, time-sorted per ticker)
+        periods: Period number of each bar
+
+    Returns:
+        DataFrame of Open/High/Low/Close indexed by ticker, with a period column
+        (tickers with fewer than 2 complete periods left out)
+    """
+    ohlc = prices.assign(period=periods).groupby(['ticker', 'period']).agg(
+        Open=('Open', 'first'),
+        High=('High', 'max'),
+        Low=('Low', 'min'),
+        Close=('Close', 'last')
+    ).dropna()
+
+    # nth(-2) because -1 is the current incomplete period
+    return ohlc.groupby(level='ticker').nth(-2).reset_index(level='period')
+
+def detect_all_crossovers(tickers, results_dir):
+    """
+    Detect monthly/quarterly crossovers for many tickers at once
+
+    Every ticker's prices go into one long frame with a ticker column, so
+    the monthly and quarterly OHLC of all tickers come from one grouped
+    aggregation each instead of a pass per ticker.
+
+    Args:
+        tickers: Ticker symbols with a CSV in results_dir
+        results_dir: Directory containing CSV files
+
+    Returns:
+        List of crossover dicts (as from crossover_result) in ticker order
+    """
+    frames = {}
+    latest = {}
+    load = partial(load_ticker_prices_safe, results_dir=results_dir)
+
+    # Loading is mostly file I/O and pyarrow parsing, so threads overlap the reads
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for i, (ticker, df) in enumerate(zip(tickers, executor.map(load, tickers))):
+            if (i + 1) % 100 == 0:
+                print(f"Progress: {i + 1}/{len(tickers)} tickers scanned...")
+
+            if df is not None:
+                frames[ticker] = df
+                latest[ticker] = (df.index[-1], df['Close'].iloc[-1])
+
+    if not frames:
+        return []
+
+    # Resample semantics: bars in time order within each ticker
+    prices = pd.concat(frames, names=['ticker', 'Date']).reset_index()
+    prices = prices.sort_values(['ticker', 'Date'], kind='stable')
+    months = prices['Date'].dt.tz_convert(None).to_numpy().astype('datetime64[M]').astype(np.int64)
+
+    monthly = previous_periods(prices, months)
+    quarterly = previous_periods(prices, months // 3)
+
+    # Need at least 2 complete months and 2 complete quarters
+    both = monthly.join(quarterly, how='inner', lsuffix='_month', rsuffix='_quarter')
+    columns = {column: both[column].to_numpy() for column in both.columns}
+
+    all_crossovers = []
+    for i, ticker in enumerate(both.index):
+        prev_month = {key: columns[f"{key}_month"][i] for key in ['Open', 'High', 'Low', 'Close']}
+        prev_quarter = {key: columns[f"{key}_quarter"][i] for key in ['Open', 'High', 'Low', 'Close']}
+        current_date, current_price = latest[ticker]
+
+        result = crossover_result(ticker, current_date, current_price,
+                                  period_end(columns['period_month'][i]), prev_month,
+                                  period_end(columns['period_quarter'][i] * 3 + 2), prev_quarter)
+        if result:
+            all_crossovers.append(result)
+
+    return all_crossovers
+
 def run_crossover_scan():
     """
     Run the Monthly/Quarterly Crossover scan across all tickers
     """
-    print("=" * 80)
+    print(SEP)
     print("MONTHLY vs QUARTERLY CROSSOVER SCANNER")
-    print("=" * 80)
+    print(SEP)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     print("SCANNING FOR:")
@@ -169,7 +254,7 @@ def run_crossover_scan():
     print("  - Previous Month Close < Previous Quarter Open (confirmed weakness)")
     print()
     print("Finding stocks with potential breakdowns or weakness signals...")
-    print("=" * 80)
+    print(SEP)
     print()
 
     # Get ticker list
@@ -178,16 +263,7 @@ def run_crossover_scan():
     print()
 
     # Scan all tickers
-    all_crossovers = []
-
-    for i, ticker in enumerate(tickers):
-        if (i + 1) % 100 == 0:
-            print(f"Progress: {i + 1}/{len(tickers)} tickers scanned...")
-
-        result = detect_monthly_quarterly_crossover(ticker, results_dir)
-
-        if result:
-            all_crossovers.append(result)
+    all_crossovers = detect_all_crossovers(tickers, results_dir)
 
     print()
     print(f"Scan complete!")
@@ -220,10 +296,11 @@ def run_crossover_scan():
 
     # Generate report
     report_lines = []
-    report_lines.append("=" * 80)
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    report_lines.append(SEP)
     report_lines.append("MONTHLY vs QUARTERLY CROSSOVER SCANNER - BREAKDOWN SIGNALS")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Scan Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report_lines.append(SEP)
+    report_lines.append(f"Scan Date: {now_str}")
     report_lines.append("")
     report_lines.append("CONCEPT:")
     report_lines.append("  When previous month's levels cross below previous quarter's levels,")
@@ -235,15 +312,15 @@ def run_crossover_scan():
     report_lines.append(f"  Severe Weakness: {len(severe_weakness)} (Month Low < Quarter Low)")
     report_lines.append(f"  Moderate Weakness: {len(moderate_weakness)} (Below Quarter Open)")
     report_lines.append("")
-    report_lines.append("=" * 80)
+    report_lines.append(SEP)
     report_lines.append("")
 
     # CONFIRMED BREAKDOWNS - Most severe
     if confirmed_breakdowns:
         report_lines.append("[CRITICAL] CONFIRMED BREAKDOWNS (Month Close < Quarter Low):")
-        report_lines.append("=" * 80)
+        report_lines.append(SEP)
         report_lines.append(f"{'Ticker':<8} {'Current':<10} {'M-Close':<10} {'Q-Low':<10} {'Breakdown%':<12} {'Recovery%':<12} {'Signals'}")
-        report_lines.append("-" * 80)
+        report_lines.append(THIN_SEP)
 
         for stock in confirmed_breakdowns:
             signals_str = ", ".join(stock['crossovers'])
@@ -258,15 +335,15 @@ def run_crossover_scan():
             )
 
         report_lines.append("")
-        report_lines.append("=" * 80)
+        report_lines.append(SEP)
         report_lines.append("")
 
     # SEVERE WEAKNESS - Month low breached quarter low
     if severe_weakness:
         report_lines.append("[WARNING] SEVERE WEAKNESS (Month Low < Quarter Low):")
-        report_lines.append("=" * 80)
+        report_lines.append(SEP)
         report_lines.append(f"{'Ticker':<8} {'Current':<10} {'M-Low':<10} {'Q-Low':<10} {'Breach%':<12} {'Recovery%':<12} {'Signals'}")
-        report_lines.append("-" * 80)
+        report_lines.append(THIN_SEP)
 
         for stock in severe_weakness:
             signals_str = ", ".join(stock['crossovers'])
@@ -281,15 +358,15 @@ def run_crossover_scan():
             )
 
         report_lines.append("")
-        report_lines.append("=" * 80)
+        report_lines.append(SEP)
         report_lines.append("")
 
     # MODERATE WEAKNESS
     if moderate_weakness:
         report_lines.append("[CAUTION] MODERATE WEAKNESS (Below Quarter Open):")
-        report_lines.append("=" * 80)
+        report_lines.append(SEP)
         report_lines.append(f"{'Ticker':<8} {'Current':<10} {'M-Close':<10} {'Q-Open':<10} {'Breach%':<12} {'Recovery%':<12} {'Signals'}")
-        report_lines.append("-" * 80)
+        report_lines.append(THIN_SEP)
 
         for stock in moderate_weakness:
             signals_str = ", ".join(stock['crossovers'])
@@ -304,14 +381,14 @@ def run_crossover_scan():
             )
 
         report_lines.append("")
-        report_lines.append("=" * 80)
+        report_lines.append(SEP)
         report_lines.append("")
 
     # DETAILED TABLE - All stocks
     report_lines.append("DETAILED ANALYSIS - ALL CROSSOVER STOCKS:")
-    report_lines.append("-" * 80)
+    report_lines.append(THIN_SEP)
     report_lines.append(f"{'Ticker':<8} {'M-Low':<10} {'M-Close':<10} {'Q-Low':<10} {'Q-Open':<10} {'Category':<20}")
-    report_lines.append("-" * 80)
+    report_lines.append(THIN_SEP)
 
     for stock in all_crossovers:
         if stock in confirmed_breakdowns:
@@ -331,7 +408,7 @@ def run_crossover_scan():
         )
 
     report_lines.append("")
-    report_lines.append("=" * 80)
+    report_lines.append(SEP)
     report_lines.append("")
     report_lines.append("LEGEND:")
     report_lines.append("  M-Low/M-Close: Previous Month Low/Close")
@@ -363,52 +440,52 @@ def run_crossover_scan():
         f.write(report_text)
 
     # Create TradingView lists
-    create_tradingview_lists(confirmed_breakdowns, severe_weakness, moderate_weakness)
+    create_tradingview_lists(confirmed_breakdowns, severe_weakness, moderate_weakness, now_str)
 
     # Print to console
     print(report_text)
     print(f"Report saved to: {output_file}")
 
-def create_tradingview_lists(confirmed_breakdowns, severe_weakness, moderate_weakness):
-    """Create TradingView watchlists for each category"""
+def create_tradingview_lists(confirmed_breakdowns, severe_weakness, moderate_weakness, now_str):
+    """Create TradingView watchlists for each category (now_str is the report's timestamp)"""
 
     # Confirmed Breakdowns
-    with open(os.path.join(buylist_dir, 'tradingview_confirmed_breakdowns.txt'), 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
+    with open(confirmed_breakdowns_file, 'w', encoding='utf-8') as f:
+        f.write(SEP + "\n")
         f.write("CONFIRMED BREAKDOWNS - Month Close < Quarter Low\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(SEP + "\n")
+        f.write(f"Generated: {now_str}\n")
         f.write(f"Total symbols: {len(confirmed_breakdowns)}\n")
-        f.write("=" * 80 + "\n\n")
+        f.write(SEP + "\n\n")
         f.write("Copy the line below and paste into TradingView watchlist:\n")
-        f.write("-" * 80 + "\n\n")
+        f.write(THIN_SEP + "\n\n")
 
         if confirmed_breakdowns:
             tickers = [stock['ticker'] for stock in confirmed_breakdowns]
             f.write(",".join(tickers) + "\n\n")
-            f.write("-" * 80 + "\n\n")
+            f.write(THIN_SEP + "\n\n")
             f.write("Individual symbols (one per line):\n")
-            f.write("-" * 80 + "\n")
+            f.write(THIN_SEP + "\n")
             for ticker in tickers:
                 f.write(ticker + "\n")
 
     # Severe Weakness
-    with open(os.path.join(buylist_dir, 'tradingview_severe_weakness.txt'), 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
+    with open(severe_weakness_file, 'w', encoding='utf-8') as f:
+        f.write(SEP + "\n")
         f.write("SEVERE WEAKNESS - Month Low < Quarter Low\n")
-        f.write("=" * 80 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(SEP + "\n")
+        f.write(f"Generated: {now_str}\n")
         f.write(f"Total symbols: {len(severe_weakness)}\n")
-        f.write("=" * 80 + "\n\n")
+        f.write(SEP + "\n\n")
         f.write("Copy the line below and paste into TradingView watchlist:\n")
-        f.write("-" * 80 + "\n\n")
+        f.write(THIN_SEP + "\n\n")
 
         if severe_weakness:
             tickers = [stock['ticker'] for stock in severe_weakness]
             f.write(",".join(tickers) + "\n\n")
-            f.write("-" * 80 + "\n\n")
+            f.write(THIN_SEP + "\n\n")
             f.write("Individual symbols (one per line):\n")
-            f.write("-" * 80 + "\n")
+            f.write(THIN_SEP + "\n")
             for ticker in tickers:
                 f.write(ticker + "\n")
 
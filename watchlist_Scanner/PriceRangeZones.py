@@ -6,6 +6,10 @@ from datetime import datetime
 # Get the directory where this script is located
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
+# Categories of the price_zone and trend columns, in code order
+PRICE_ZONES = ['buy_zone', 'neutral_zone', 'sell_zone']
+TRENDS = ['neutral', 'uptrend', 'downtrend']
+
 def calculate_price_range_zones(df, lookback_period=100):
     """
     Calculate dynamic price range zones for a stock
@@ -58,16 +62,10 @@ def calculate_price_range_zones(df, lookback_period=100):
     range_position = ((current_price - range_floor) / (range_ceiling - range_floor)) * 100
 
     # Determine if price is in buy zone (0-35%), neutral (35-65%), or sell zone (65-100%)
-    price_zone = pd.Series(index=df.index, dtype=str)
-
-    for i in range(len(df)):
-        pos = range_position.iloc[i]
-        if pos <= 35:
-            price_zone.iloc[i] = 'buy_zone'
-        elif pos >= 65:
-            price_zone.iloc[i] = 'sell_zone'
-        else:
-            price_zone.iloc[i] = 'neutral_zone'
+    # (NaN positions fall through to neutral). Stored as int8 codes into PRICE_ZONES.
+    pos = range_position.to_numpy()
+    zone_codes = np.select([pos <= 35, pos >= 65], [0, 2], default=1).astype(np.int8)
+    price_zone = pd.Series(pd.Categorical.from_codes(zone_codes, categories=PRICE_ZONES), index=df.index)
 
     # Create results DataFrame
     results = pd.DataFrame({
@@ -97,21 +95,17 @@ def determine_trend(df, lookback_period=50):
         lookback_period: Period for trend SMA
 
     Returns:
-        Series with trend direction ('uptrend', 'downtrend', 'neutral')
+        Categorical Series with trend direction ('uptrend', 'downtrend', 'neutral')
     """
     sma = df['Close'].rolling(window=lookback_period).mean()
 
-    trend = pd.Series(index=df.index, dtype=str)
+    sma_values = sma.to_numpy()
+    close = df['Close'].to_numpy()
 
-    for i in range(len(df)):
-        if pd.isna(sma.iloc[i]):
-            trend.iloc[i] = 'neutral'
-        elif df['Close'].iloc[i] > sma.iloc[i]:
-            trend.iloc[i] = 'uptrend'
-        else:
-            trend.iloc[i] = 'downtrend'
+    # int8 codes into TRENDS
+    trend_codes = np.select([np.isnan(sma_values), close > sma_values], [0, 1], default=2).astype(np.int8)
 
-    return trend
+    return pd.Series(pd.Categorical.from_codes(trend_codes, categories=TRENDS), index=df.index)
 
 def analyze_ticker_zones(ticker_symbol, results_dir):
     """
@@ -14,6 +14,9 @@ buylist_dir = os.path.join(script_dir, 'buylist')
 output_file = os.path.join(buylist_dir, 'triple_signal_scan_results.txt')
 tradingview_file = os.path.join(buylist_dir, 'tradingview_triple_signal_list.txt')
 
+# Force Index colors that count as bearish/oversold momentum
+BEARISH_FI_COLORS = frozenset(['maroon', 'orange'])
+
 def get_ticker_list(results_dir):
     """Get ticker symbols from CSV files in the results directory"""
     try:
@@ -111,25 +114,28 @@ def scan_triple_signal(ticker_symbol, results_dir):
         # 4. Determine trend
         trend = determine_trend(df, lookback_period=50)
 
-        # Get most recent values
+        # Get most recent values (one row lookup per frame)
         latest_idx = -1
-        fi_color = efi_results['fi_color'].iloc[latest_idx]
-        normalized_price = efi_results['normalized_price'].iloc[latest_idx]
-        force_index = efi_results['force_index'].iloc[latest_idx]
+        efi_latest = efi_results.iloc[latest_idx]
+        zones_latest = zones.iloc[latest_idx]
+
+        fi_color = efi_latest['fi_color']
+        normalized_price = efi_latest['normalized_price']
+        force_index = efi_latest['force_index']
 
         current_price = df['Close'].iloc[latest_idx]
-        price_zone = zones['price_zone'].iloc[latest_idx]
+        price_zone = zones_latest['price_zone']
         current_trend = trend.iloc[latest_idx]
-        range_position = zones['range_position_pct'].iloc[latest_idx]
-        zone_25 = zones['zone_25_pct'].iloc[latest_idx]
-        zone_75 = zones['zone_75_pct'].iloc[latest_idx]
-        range_floor = zones['range_floor'].iloc[latest_idx]
-        range_ceiling = zones['range_ceiling'].iloc[latest_idx]
+        range_position = zones_latest['range_position_pct']
+        zone_25 = zones_latest['zone_25_pct']
+        zone_75 = zones_latest['zone_75_pct']
+        range_floor = zones_latest['range_floor']
+        range_ceiling = zones_latest['range_ceiling']
 
         # TRIPLE SIGNAL CONDITIONS:
         condition_1_channel = in_channel
         condition_2_price_zone = price_zone == 'buy_zone'
-        condition_3_efi = fi_color in ['maroon', 'orange']  # Bearish/oversold momentum
+        condition_3_efi = fi_color in BEARISH_FI_COLORS  # Bearish/oversold momentum
         condition_4_trend = current_trend == 'uptrend'
 
         # All 4 conditions must be met
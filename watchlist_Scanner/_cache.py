@@ -0,0 +1,162 @@
+"""
+Shared on-disk caches for the scanners
+
+Every scanner keeps its caches in a subdirectory of CACHE_ROOT, so
+there is one directory to clear and one entry in .gitignore instead of
+a cache directory per scanner inside the source tree.
+
+Each cache entry is stored with a key from cache_key(): the source CSV's
+mtime (in nanoseconds) and size plus whatever else the entry depends on
+(code version, parameters). An entry is reused only while its key still
+matches, so edits to the CSV, the code or the settings all rebuild it.
+"""
+
+import hashlib
+import inspect
+import os
+import numpy as np
+from functools import lru_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# All scanner caches live under this directory (ignored by git)
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scanner_cache')
+
+
+def cache_dir(name):
+    """Get the directory of one cache under CACHE_ROOT"""
+    return os.path.join(CACHE_ROOT, name)
+
+
+@lru_cache(maxsize=None)
+def _file_hash(path):
+    """Get a short hash of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+
+def source_version(*sources):
+    """
+    Get a version string for the code a cache entry was built with
+
+    Args:
+        sources: Source file paths, or modules / classes / functions
+            (hashed by the file they are defined in)
+
+    Returns:
+        String that changes whenever any of the source files is edited
+    """
+    return '_'.join(_file_hash(source if isinstance(source, str) else inspect.getsourcefile(source))
+                    for source in sources)
+
+
+def cache_key(source_file, *parts):
+    """
+    Get the key of a cache entry built from source_file
+
+    Args:
+        source_file: File the entry was built from (usually a ticker's CSV)
+        parts: Anything else the entry depends on - code versions from
+            source_version(), parameters, ...
+
+    Returns:
+        Key string, different whenever the file or any of the parts change
+    """
+    stat = os.stat(source_file)
+    parts_hash = hashlib.sha1(repr(parts).encode()).hexdigest()[:12]
+    return f"{stat.st_mtime_ns}_{stat.st_size}_{parts_hash}"
+
+
+def _write_atomically(cache_file, write):
+    """Write a cache file via write(path), through a temp file so an interrupted run never leaves a broken cache"""
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    write(temp_file)
+    os.replace(temp_file, cache_file)
+
+
+def read_cached_table(cache_file, key):
+    """
+    Read a Parquet cache entry written by write_cached_table
+
+    Returns:
+        pyarrow Table, or None without pyarrow, when there is no entry, or
+        when it was written with a different key
+    """
+    if not PYARROW_AVAILABLE or not os.path.exists(cache_file):
+        return None
+
+    table = pq.read_table(cache_file)
+    if (table.schema.metadata or {}).get(b'cache_key') != key.encode():
+        return None
+
+    return table
+
+
+def write_cached_table(cache_file, key, table, **write_options):
+    """Write a pyarrow Table as a Parquet cache entry (options are passed to pq.write_table)"""
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'cache_key': key.encode()})
+    _write_atomically(cache_file, lambda path: pq.write_table(table, path, **write_options))
+
+
+def read_cached_frame(cache_file, key):
+    """Read a DataFrame written by write_cached_frame, or None (as read_cached_table)"""
+    table = read_cached_table(cache_file, key)
+    return None if table is None else table.to_pandas()
+
+
+def write_cached_frame(cache_file, key, df):
+    """Write a DataFrame as a Parquet cache entry (nothing is written without pyarrow)"""
+    if PYARROW_AVAILABLE:
+        write_cached_table(cache_file, key, pa.Table.from_pandas(df))
+
+
+def cached_frame(cache_file, key, build):
+    """
+    Get a DataFrame from its Parquet cache entry, or build() it and cache it
+
+    Without pyarrow nothing is cached and build() runs every time.
+    """
+    df = read_cached_frame(cache_file, key)
+
+    if df is None:
+        df = build()
+        write_cached_frame(cache_file, key, df)
+
+    return df
+
+
+def cached_array(cache_file, key, build):
+    """
+    Get a NumPy array from its .npy cache entry, or build() it and cache it
+
+    Cached arrays are memory-mapped read-only. A .npy file has no room for
+    metadata, so the key is kept next to it in cache_file + '.key', written
+    after the array so a half-written entry never looks fresh.
+    """
+    key_file = f"{cache_file}.key"
+
+    if os.path.exists(cache_file) and os.path.exists(key_file):
+        with open(key_file) as f:
+            if f.read() == key:
+                return np.load(cache_file, mmap_mode='r')
+
+    data = build()
+
+    def write_array(path):
+        with open(path, 'wb') as f:
+            np.save(f, data)
+
+    def write_key(path):
+        with open(path, 'w') as f:
+            f.write(key)
+
+    _write_atomically(cache_file, write_array)
+    _write_atomically(key_file, write_key)
+
+    return data
@@ -0,0 +1,25 @@
+"""
+Optional Numba support for the scanners
+
+Import njit from here instead of from numba directly. When numba is
+installed it is the real numba.njit; when it isn't, njit becomes a
+no-op decorator so the decorated kernels still run as plain Python.
+Check NUMBA_AVAILABLE to pick a vectorized numpy path instead of a
+slow interpreted loop.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,132 @@
+"""
+Shared price CSV readers for the scanners
+
+Every scanner reads the same ticker CSVs, so the parsing lives here once
+and each scanner only says which columns it keeps.
+"""
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - only needed as the pandas CSV engine
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional: polars' lazy CSV scan reads the price columns faster
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Column names for CSV files saved without a header row
+PRICE_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+# The price columns the channel scanners read (see read_price_columns)
+CHANNEL_COLUMNS = ['High', 'Low', 'Close']
+
+
+def parse_dates_utc(values):
+    """
+    Parse date strings to UTC, with unparseable entries as NaT
+
+    Tries the ISO 8601 fast path first, so a stray header row left in the
+    data doesn't push every row through dateutil. Only when nothing parses
+    as ISO 8601 does it fall back to pandas' format inference.
+    """
+    dates = pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601')
+
+    if dates.isna().all():
+        dates = pd.to_datetime(values, errors='coerce', utc=True)
+
+    return dates
+
+
+def read_price_csv(csv_file, dtypes, iso8601_first=False):
+    """
+    Parse a ticker's CSV (with or without a header row)
+
+    Uses the multithreaded pyarrow CSV engine when it is installed, which
+    also parses the date column to UTC on the way in. Dates without an
+    offset are taken as UTC.
+
+    Args:
+        csv_file: Path to the CSV file
+        dtypes: Dict of column -> dtype; only these columns are kept
+        iso8601_first: Parse dates the reader couldn't (no pyarrow, or stray
+            non-date rows) with parse_dates_utc instead of a per-row parse
+
+    Returns:
+        DataFrame with the dtypes columns indexed by UTC date, rows with
+        unparseable dates dropped
+    """
+    if PYARROW_AVAILABLE:
+        read_options = {'engine': 'pyarrow', 'parse_dates': [0]}
+    else:
+        read_options = {}
+
+    # Read assuming a header row, then check the names pandas took as the header.
+    # Only headerless files (the first row was data) need a second read.
+    df = pd.read_csv(csv_file, header=0, index_col=0, **read_options)
+
+    first_line = ','.join(str(name) for name in [df.index.name, *df.columns])
+    has_header = 'Ticker' in first_line or 'Date' in first_line or 'Open' in first_line
+
+    if not has_header:
+        df = pd.read_csv(csv_file, header=None, index_col=0, names=PRICE_COLUMNS, **read_options)
+
+    if isinstance(df.index, pd.DatetimeIndex):
+        if df.index.tz is None:
+            df.index = df.index.tz_localize('UTC')
+    elif iso8601_first:
+        df.index = parse_dates_utc(df.index)
+    else:
+        df.index = pd.to_datetime(df.index, errors='coerce', utc=True)
+
+    return df.loc[df.index.notna(), list(dtypes)].astype(dtypes)
+
+
+def read_price_columns_polars(file_path, columns=CHANNEL_COLUMNS):
+    """
+    Fast path for read_price_columns using a polars lazy CSV scan
+
+    Only the date column and columns are read (dates are left as the
+    strings in the file). Returns None when the file doesn't have those
+    columns, and raises a polars error when a value can't be converted, so
+    the caller can fall back to pandas.
+    """
+    lf = pl.scan_csv(file_path, schema_overrides={col: pl.Float64 for col in columns})
+
+    names = lf.collect_schema().names()
+    if not all(col in names for col in columns) or names[0] in columns:
+        return None
+
+    df = lf.select(names[0], *columns).collect()
+
+    return pd.DataFrame({col: df[col].to_numpy() for col in columns},
+                        index=pd.Index(df[names[0]].to_numpy(), name=names[0]))
+
+
+def read_price_columns(file_path, columns=CHANNEL_COLUMNS, date_format=None):
+    """
+    Parse a price CSV with the fastest reader that can handle the file
+
+    Args:
+        file_path: Path to the CSV file
+        columns: Price columns the caller needs (the polars path reads only these)
+        date_format: date_format for the pandas fallback, e.g. 'ISO8601'
+
+    Returns:
+        DataFrame indexed by the file's first column - left as the file's
+        strings by polars, parsed as dates by the pandas fallback
+    """
+    if POLARS_AVAILABLE:
+        try:
+            data = read_price_columns_polars(file_path, columns)
+            if data is not None:
+                return data
+        except pl.exceptions.PolarsError:
+            pass  # Messy file - let pandas read it
+
+    return pd.read_csv(file_path, index_col=0, parse_dates=True, date_format=date_format)